@@ -1,17 +1,39 @@
 from typing import Dict, List, Tuple
 from core.agent import ActiveAgent
 from core.message import Message
-from utils.logger import setup_logger
+from orderbook.order_book import INF
+import itertools
 import random
+import sys
 
 
 class LiquidityProviderAgent(ActiveAgent):
     """Liquidity provider agent that places limit orders to create liquidity and makes random market trades"""
     
-    def __init__(self, agent_id: str, symbol: str):
+    __slots__ = (
+        "symbol", "rng", "orderbook_topic", "price_topic", "order_topic", "cancel_batch_topic",
+        "initial_fair_value", "spread", "limit_order_size", "market_order_size", "max_orders_per_side",
+        "level_spacing", "side_draw_batch_size", "_bid_prefix", "_ask_prefix", "_market_prefixes",
+        "_order_seq", "_ladder_key", "_ladder_offsets_bps", "_side_draws", "_side_index",
+        "_ladder_payloads", "_ladder_sent_at", "active_limit_orders", "last_order_book_state",
+        "liquidity_provision_interval", "market_trade_interval", "last_liquidity_provision",
+        "last_market_trade"
+    )
+    
+    def __init__(self, agent_id: str, symbol: str, seed=None):
         super().__init__(agent_id)
         self.symbol = symbol
-        self.logger = setup_logger(f"LiquidityProviderAgent.{agent_id}")
+        # Per-agent generator; seeded from the agent ID so runs are reproducible
+        self.rng = random.Random(agent_id if seed is None else seed)
+        
+        # Topic strings are built once and reused for every message; inbound
+        # messages are dispatched to the handlers registered per topic
+        self.orderbook_topic = sys.intern(f"{symbol}.ORDERBOOK")
+        self.price_topic = sys.intern(f"{symbol}.PRICE")
+        self.order_topic = sys.intern(f"{symbol}.ORDER")
+        self.cancel_batch_topic = sys.intern(f"{symbol}.CANCEL_BATCH")
+        self.add_message_handler(self.orderbook_topic, self._update_order_book_state)
+        self.add_message_handler(self.price_topic, self._process_price_update)
         
         # Liquidity provision parameters
         self.initial_fair_value = 100.0
@@ -19,9 +41,32 @@ class LiquidityProviderAgent(ActiveAgent):
         self.limit_order_size = 20
         self.market_order_size = 10
         self.max_orders_per_side = 5
+        self.level_spacing = 0.005  # 0.5% between ladder levels
+        self.side_draw_batch_size = 256  # random sides drawn per RNG call
+        
+        # Order IDs are a cached prefix plus a per-agent sequence number
+        self._bid_prefix = f"{agent_id}_BID_"
+        self._ask_prefix = f"{agent_id}_ASK_"
+        self._market_prefixes = {
+            "BUY": f"{agent_id}_MARKET_BUY_",
+            "SELL": f"{agent_id}_MARKET_SELL_"
+        }
+        self._order_seq = itertools.count()
+        
+        # Ladder level offsets in basis points, rebuilt only when the ladder parameters change
+        self._ladder_key = None
+        self._ladder_offsets_bps: List[int] = []
+        
+        # Prefilled random market trade sides, consumed in order
+        self._side_draws: List[str] = []
+        self._side_index = 0
+        
+        # Order payloads of the last ladder, refilled in place once delivered
+        self._ladder_payloads: List[dict] = []
+        self._ladder_sent_at = -1
         
         # State tracking
-        self.active_limit_orders = {}  # order_id -> side
+        self.active_limit_orders: List[str] = []  # IDs of resting orders
         self.last_order_book_state = None
         self.liquidity_provision_interval = 1000  # Place liquidity every 1000ms
         self.market_trade_interval = 2000  # Make market trades every 2000ms
@@ -31,24 +76,25 @@ class LiquidityProviderAgent(ActiveAgent):
     def initialize(self):
         """Initialize subscriptions and schedule first actions"""
         # Subscribe to relevant market data
-        self.subscribe(f"{self.symbol}.ORDERBOOK")
-        self.subscribe(f"{self.symbol}.PRICE")
+        self.subscribe(self.orderbook_topic)
+        self.subscribe(self.price_topic)
         
         # Schedule first actions
         self.schedule_wakeup(500)  # First wakeup after 500ms
     
-    def receive_message(self, message: Message):
-        """Process incoming market data"""
-        if message.topic == f"{self.symbol}.ORDERBOOK":
-            self.last_order_book_state = message.payload
-        elif message.topic == f"{self.symbol}.PRICE":
-            # Update fair value based on market prices if needed
-            pass
+    def _update_order_book_state(self, message: Message):
+        """Keep the latest order book snapshot"""
+        self.last_order_book_state = message.payload
+    
+    def _process_price_update(self, message: Message):
+        """Process price updates"""
+        # Update fair value based on market prices if needed
+        pass
     
     def wakeup(self, current_time: int):
         """Called periodically to place limit orders and market trades"""
         super().wakeup(current_time)
-        self.logger.debug(f"LiquidityProviderAgent {self.agent_id} waking up at {current_time}ms")
+        self.logger.debug("LiquidityProviderAgent %s waking up at %dms", self.agent_id, current_time)
         
         # Place limit orders to create liquidity if order book is empty or enough time has passed
         if (current_time - self.last_liquidity_provision >= self.liquidity_provision_interval or 
@@ -83,7 +129,7 @@ class LiquidityProviderAgent(ActiveAgent):
     
     def _place_limit_orders(self, current_time: int):
         """Place limit orders to create liquidity"""
-        self.logger.info(f"Placing limit orders to create liquidity at time {current_time}ms")
+        self.logger.info("Placing limit orders to create liquidity at time %dms", current_time)
         
         # Cancel existing limit orders first
         self._cancel_existing_limit_orders()
@@ -91,66 +137,99 @@ class LiquidityProviderAgent(ActiveAgent):
         # Determine fair value for pricing
         fair_value = self.initial_fair_value
         if self.last_order_book_state:
-            best_bid = self.last_order_book_state.get("best_bid", 0)
-            best_ask = self.last_order_book_state.get("best_ask", float('inf'))
-            if best_bid > 0 and best_ask < float('inf'):
+            best_bid = self.last_order_book_state["best_bid"]
+            best_ask = self.last_order_book_state["best_ask"]
+            if best_bid > 0 and best_ask < INF:
                 fair_value = (best_bid + best_ask) / 2
             elif best_bid > 0:
                 fair_value = best_bid
-            elif best_ask < float('inf'):
+            elif best_ask < INF:
                 fair_value = best_ask
         
+        # The kernel delivers messages before waking agents at a later timestamp, so
+        # payloads sent earlier are no longer referenced and can be reused in place
+        if (current_time <= self._ladder_sent_at or
+                len(self._ladder_payloads) != 2 * self.max_orders_per_side):
+            self._ladder_payloads = [
+                {"order_id": None, "symbol": self.symbol, "side": side, "price": 0.0, "quantity": 0}
+                for _ in range(self.max_orders_per_side)
+                for side in ("BUY", "SELL")
+            ]
+        self._ladder_sent_at = current_time
+        
         # Place multiple levels of limit orders on both sides
+        # Ladder prices are computed in integer cents so every level sits exactly on the price grid
+        self._update_ladder_offsets()
+        fair_value_ticks = round(fair_value * 100)
+        orders = []
         for i in range(self.max_orders_per_side):
+            offset_ticks = (fair_value_ticks * self._ladder_offsets_bps[i] + 5000) // 10000
+            
             # Place bid orders (BUY)
-            bid_price = round(fair_value * (1 - self.spread/2 - i * 0.005), 2)
-            bid_id = f"{self.agent_id}_BID_{i}_{current_time}"
-            bid_order = {
-                "order_id": bid_id,
-                "symbol": self.symbol,
-                "side": "BUY",
-                "price": bid_price,
-                "quantity": self.limit_order_size
-            }
-            self.send_message(f"{self.symbol}.ORDER", bid_order)
-            self.active_limit_orders[bid_id] = "BUY"
+            bid_price = (fair_value_ticks - offset_ticks) / 100
+            bid_id = self._bid_prefix + str(next(self._order_seq))
+            bid_order = self._ladder_payloads[2 * i]
+            bid_order["order_id"] = bid_id
+            bid_order["price"] = bid_price
+            bid_order["quantity"] = self.limit_order_size
+            orders.append(bid_order)
+            self.active_limit_orders.append(bid_id)
             
             # Place ask orders (SELL)
-            ask_price = round(fair_value * (1 + self.spread/2 + i * 0.005), 2)
-            ask_id = f"{self.agent_id}_ASK_{i}_{current_time}"
-            ask_order = {
-                "order_id": ask_id,
-                "symbol": self.symbol,
-                "side": "SELL",
-                "price": ask_price,
-                "quantity": self.limit_order_size
-            }
-            self.send_message(f"{self.symbol}.ORDER", ask_order)
-            self.active_limit_orders[ask_id] = "SELL"
+            ask_price = (fair_value_ticks + offset_ticks) / 100
+            ask_id = self._ask_prefix + str(next(self._order_seq))
+            ask_order = self._ladder_payloads[2 * i + 1]
+            ask_order["order_id"] = ask_id
+            ask_order["price"] = ask_price
+            ask_order["quantity"] = self.limit_order_size
+            orders.append(ask_order)
+            self.active_limit_orders.append(ask_id)
+        
+        self.send_messages(self.order_topic, orders)
+    
+    def _update_ladder_offsets(self):
+        """Precompute the distance of each ladder level from fair value in basis points"""
+        key = (self.spread, self.max_orders_per_side, self.level_spacing)
+        if key == self._ladder_key:
+            return
+        self._ladder_offsets_bps = [
+            round((self.spread/2 + i * self.level_spacing) * 10000)
+            for i in range(self.max_orders_per_side)
+        ]
+        self._ladder_key = key
     
     def _cancel_existing_limit_orders(self):
         """Cancel all existing limit orders"""
-        for order_id in list(self.active_limit_orders.keys()):
-            cancel_message = {
-                "order_id": order_id,
-                "symbol": self.symbol
-            }
-            self.send_message(f"{self.symbol}.CANCEL", cancel_message)
-        self.active_limit_orders.clear()
+        if self.active_limit_orders:
+            # The sent list is handed over to the message and replaced, not copied
+            self.send_message(self.cancel_batch_topic, {
+                "symbol": self.symbol,
+                "order_ids": self.active_limit_orders
+            })
+            self.active_limit_orders = []
+    
+    def _draw_side(self) -> str:
+        """Draw a random side from a prefilled batch, refilling it when used up"""
+        if self._side_index >= len(self._side_draws):
+            self._side_draws = self.rng.choices(("BUY", "SELL"), k=self.side_draw_batch_size)
+            self._side_index = 0
+        side = self._side_draws[self._side_index]
+        self._side_index += 1
+        return side
     
     def _make_random_market_trade(self, current_time: int):
         """Make a random market trade"""
-        self.logger.info(f"Making random market trade at time {current_time}ms")
+        self.logger.info("Making random market trade at time %dms", current_time)
         
         # Randomly decide to buy or sell
-        side = random.choice(["BUY", "SELL"])
+        side = self._draw_side()
         
         # Determine price reference for market order
         price_reference = self.initial_fair_value
         if self.last_order_book_state:
-            best_bid = self.last_order_book_state.get("best_bid", 0)
-            best_ask = self.last_order_book_state.get("best_ask", float('inf'))
-            if side == "BUY" and best_ask < float('inf'):
+            best_bid = self.last_order_book_state["best_bid"]
+            best_ask = self.last_order_book_state["best_ask"]
+            if side == "BUY" and best_ask < INF:
                 price_reference = best_ask
             elif side == "SELL" and best_bid > 0:
                 price_reference = best_bid
@@ -158,9 +237,9 @@ class LiquidityProviderAgent(ActiveAgent):
         # For market orders, we use special price values:
         # - BUY market orders: price = float('inf')
         # - SELL market orders: price = 0.0
-        market_price = float('inf') if side == "BUY" else 0.0
+        market_price = INF if side == "BUY" else 0.0
         
-        order_id = f"{self.agent_id}_MARKET_{side}_{current_time}"
+        order_id = self._market_prefixes[side] + str(next(self._order_seq))
         market_order = {
             "order_id": order_id,
             "symbol": self.symbol,
@@ -168,4 +247,4 @@ class LiquidityProviderAgent(ActiveAgent):
             "price": market_price,
             "quantity": self.market_order_size
         }
-        self.send_message(f"{self.symbol}.ORDER", market_order)
\ No newline at end of file
+        self.send_message(self.order_topic, market_order)
\ No newline at end of file
@@ -1,13 +1,27 @@
 from typing import Dict, List, Tuple
 from core.agent import ActiveAgent
 from core.message import Message
-from utils.logger import setup_logger
+from orderbook.order_book import INF
+import itertools
+import operator
 import random
+import sys
+
+
+# Reads both sides of a PRICE payload in one call
+_best_bid_ask = operator.itemgetter("best_bid", "best_ask")
 
 
 class MarketMakerAgent(ActiveAgent):
     """Market maker agent that provides liquidity by posting bids and asks"""
     
+    __slots__ = (
+        "symbol", "fair_value", "_spread", "_half_spread_bps", "inventory", "max_inventory",
+        "order_size", "active_orders", "_bid_prefix", "_ask_prefix", "_order_seq",
+        "_quote_payloads", "_quotes_sent_at", "orderbook_topic", "price_topic", "trade_topic",
+        "order_topic", "cancel_batch_topic"
+    )
+    
     def __init__(self, agent_id: str, symbol: str, fair_value: float, spread: float = 0.02):
         super().__init__(agent_id)
         self.symbol = symbol
@@ -16,42 +30,60 @@ class MarketMakerAgent(ActiveAgent):
         self.inventory = 0
         self.max_inventory = 100
         self.order_size = 10
-        self.active_orders = {}  # order_id -> side
-        self.logger = setup_logger(f"MarketMakerAgent.{agent_id}")
+        self.active_orders: List[str] = []  # IDs of resting orders
+        # Order IDs are a cached prefix plus a per-agent sequence number
+        self._bid_prefix = f"{agent_id}_BID_"
+        self._ask_prefix = f"{agent_id}_ASK_"
+        self._order_seq = itertools.count()
+        # Bid/ask payload dicts reused across wakeups (see _place_quotes)
+        self._quote_payloads = None
+        self._quotes_sent_at = -1
+        
+        # Topic strings are built once and reused for every message; inbound
+        # messages are dispatched to the handlers registered per topic
+        self.orderbook_topic = sys.intern(f"{symbol}.ORDERBOOK")
+        self.price_topic = sys.intern(f"{symbol}.PRICE")
+        self.trade_topic = sys.intern(f"{symbol}.TRADE")
+        self.order_topic = sys.intern(f"{symbol}.ORDER")
+        self.cancel_batch_topic = sys.intern(f"{symbol}.CANCEL_BATCH")
+        self.add_message_handler(self.price_topic, self._update_fair_value)
+        self.add_message_handler(self.trade_topic, self._process_trade)
+        self.add_message_handler(self.orderbook_topic, self._update_quotes)
+    
+    @property
+    def spread(self) -> float:
+        """Quoted spread as a fraction of fair value"""
+        return self._spread
+    
+    @spread.setter
+    def spread(self, value: float):
+        self._spread = value
+        # Half spread in basis points, so quotes can be computed in integer cents
+        self._half_spread_bps = round(value * 5000)
     
     def initialize(self):
         """Initialize subscriptions and first orders"""
         # Subscribe to relevant market data
-        self.subscribe(f"{self.symbol}.ORDERBOOK")
-        self.subscribe(f"{self.symbol}.PRICE")
-        self.subscribe(f"{self.symbol}.TRADE")
+        self.subscribe(self.orderbook_topic)
+        self.subscribe(self.price_topic)
+        self.subscribe(self.trade_topic)
         
         # Schedule first wakeup to place orders
         self.schedule_wakeup(1000)  # Place first orders after 1 second
     
-    def receive_message(self, message: Message):
-        """Process incoming market data"""
-        if message.topic == f"{self.symbol}.PRICE":
-            self._update_fair_value(message.payload)
-        elif message.topic == f"{self.symbol}.TRADE":
-            self._process_trade(message.payload)
-        elif message.topic == f"{self.symbol}.ORDERBOOK":
-            self._update_quotes(message.payload)
-    
-    def _update_fair_value(self, price_data: dict):
+    def _update_fair_value(self, message: Message):
         """Update fair value based on market prices"""
-        best_bid = price_data.get("best_bid", 0)
-        best_ask = price_data.get("best_ask", 0)
+        best_bid, best_ask = _best_bid_ask(message.payload)
         
-        if best_bid > 0 and best_ask < float('inf'):
+        if best_bid > 0 and best_ask < INF:
             self.fair_value = (best_bid + best_ask) / 2
     
-    def _process_trade(self, trade_data: dict):
+    def _process_trade(self, message: Message):
         """Process trade executions"""
         # Update inventory based on our trades
         pass  # Implementation would track our order executions
     
-    def _update_quotes(self, orderbook_data: dict):
+    def _update_quotes(self, message: Message):
         """Update quotes based on order book"""
         # Adjust quotes based on order book depth
         pass  # Implementation would adjust based on competition
@@ -59,7 +91,7 @@ class MarketMakerAgent(ActiveAgent):
     def wakeup(self, current_time: int):
         """Place or adjust quotes"""
         super().wakeup(current_time)
-        self.logger.info(f"MarketMakerAgent {self.agent_id} waking up at {current_time}ms")
+        self.logger.info("MarketMakerAgent %s waking up at %dms", self.agent_id, current_time)
         
         # Cancel existing orders
         self._cancel_existing_orders()
@@ -73,41 +105,48 @@ class MarketMakerAgent(ActiveAgent):
     
     def _cancel_existing_orders(self):
         """Cancel all existing orders"""
-        for order_id in list(self.active_orders.keys()):
-            cancel_message = {
-                "order_id": order_id,
-                "symbol": self.symbol
-            }
-            self.send_message(f"{self.symbol}.CANCEL", cancel_message)
-            del self.active_orders[order_id]
+        if self.active_orders:
+            # The sent list is handed over to the message and replaced, not copied
+            self.send_message(self.cancel_batch_topic, {
+                "symbol": self.symbol,
+                "order_ids": self.active_orders
+            })
+            self.active_orders = []
     
     def _place_quotes(self):
         """Place new bid and ask orders"""
-        bid_price = round(self.fair_value * (1 - self.spread/2), 2)
-        ask_price = round(self.fair_value * (1 + self.spread/2), 2)
+        # Work in integer cents so both quotes sit exactly on the price grid
+        fair_value_ticks = round(self.fair_value * 100)
+        half_spread_ticks = (fair_value_ticks * self._half_spread_bps + 5000) // 10000
+        bid_price = (fair_value_ticks - half_spread_ticks) / 100
+        ask_price = (fair_value_ticks + half_spread_ticks) / 100
         
-        self.logger.info(f"Placing quotes: BID {bid_price} ASK {ask_price}")
+        self.logger.info("Placing quotes: BID %s ASK %s", bid_price, ask_price)
+        
+        # Messages are delivered before agents wake at a later timestamp, so
+        # payloads sent at an earlier time are no longer referenced and can be reused
+        current_time = self._current_timestamp()
+        if self._quote_payloads is None or current_time <= self._quotes_sent_at:
+            self._quote_payloads = (
+                {"order_id": None, "symbol": self.symbol, "side": "BUY", "price": 0.0, "quantity": 0},
+                {"order_id": None, "symbol": self.symbol, "side": "SELL", "price": 0.0, "quantity": 0}
+            )
+        self._quotes_sent_at = current_time
+        bid_order, ask_order = self._quote_payloads
         
         # Place bid
-        bid_id = f"{self.agent_id}_BID_{int(round(bid_price * 100))}"
-        bid_order = {
-            "order_id": bid_id,
-            "symbol": self.symbol,
-            "side": "BUY",
-            "price": bid_price,
-            "quantity": self.order_size
-        }
-        self.send_message(f"{self.symbol}.ORDER", bid_order)
-        self.active_orders[bid_id] = "BUY"
+        bid_id = self._bid_prefix + str(next(self._order_seq))
+        bid_order["order_id"] = bid_id
+        bid_order["price"] = bid_price
+        bid_order["quantity"] = self.order_size
+        self.active_orders.append(bid_id)
         
         # Place ask
-        ask_id = f"{self.agent_id}_ASK_{int(round(ask_price * 100))}"
-        ask_order = {
-            "order_id": ask_id,
-            "symbol": self.symbol,
-            "side": "SELL",
-            "price": ask_price,
-            "quantity": self.order_size
-        }
-        self.send_message(f"{self.symbol}.ORDER", ask_order)
-        self.active_orders[ask_id] = "SELL"
\ No newline at end of file
+        ask_id = self._ask_prefix + str(next(self._order_seq))
+        ask_order["order_id"] = ask_id
+        ask_order["price"] = ask_price
+        ask_order["quantity"] = self.order_size
+        self.active_orders.append(ask_id)
+        
+        # Both quotes go to the broker in one publish
+        self.send_messages(self.order_topic, [bid_order, ask_order])
@@ -1,62 +1,84 @@
 from typing import Dict, List, Tuple
 from core.agent import ActiveAgent
 from core.message import Message
-from utils.logger import setup_logger
+from orderbook.order_book import INF
+from utils.ring_buffer import RingBuffer
+import itertools
+import operator
 import random
+import sys
+
+
+# Reads both sides of a PRICE payload in one call
+_best_bid_ask = operator.itemgetter("best_bid", "best_ask")
 
 
 class MeanReversionTraderAgent(ActiveAgent):
     """Mean reversion trader that trades against extreme price movements"""
     
+    __slots__ = (
+        "symbol", "max_history", "price_history", "min_history", "_warmed", "position",
+        "max_position", "fair_value", "_order_prefixes", "_order_seq", "price_topic", "stats_topic",
+        "order_topic"
+    )
+    
     def __init__(self, agent_id: str, symbol: str):
         super().__init__(agent_id)
         self.symbol = symbol
-        self.price_history = []
         self.max_history = 20
+        self.price_history = RingBuffer(self.max_history)  # recent mid prices
+        self.min_history = 10  # prices needed before trading
+        self._warmed = False  # set once min_history prices have been seen
         self.position = 0
         self.max_position = 100
         self.fair_value = 100.0  # Initial fair value
-        self.logger = setup_logger(f"MeanReversionTraderAgent.{agent_id}")
+        # Order IDs are a cached prefix plus a per-agent sequence number
+        self._order_prefixes = {
+            "BUY": f"{agent_id}_BUY_",
+            "SELL": f"{agent_id}_SELL_"
+        }
+        self._order_seq = itertools.count()
+        
+        # Topic strings are built once and reused for every message; inbound
+        # messages are dispatched to the handlers registered per topic
+        self.price_topic = sys.intern(f"{symbol}.PRICE")
+        self.stats_topic = sys.intern(f"{symbol}.STATS")
+        self.order_topic = sys.intern(f"{symbol}.ORDER")
+        self.add_message_handler(self.price_topic, self._process_price_update)
+        self.add_message_handler(self.stats_topic, self._update_fair_value)
     
     def initialize(self):
         """Initialize subscriptions"""
-        self.subscribe(f"{self.symbol}.PRICE")
-        self.subscribe(f"{self.symbol}.STATS")
-    
-    def receive_message(self, message: Message):
-        """Process incoming market data"""
-        if message.topic == f"{self.symbol}.PRICE":
-            self._process_price_update(message.payload, message.timestamp)
-        elif message.topic == f"{self.symbol}.STATS":
-            self._update_fair_value(message.payload)
+        self.subscribe(self.price_topic)
+        self.subscribe(self.stats_topic)
     
-    def _process_price_update(self, price_data: dict, timestamp: int):
+    def _process_price_update(self, message: Message):
         """Process price updates and check for mean reversion signals"""
-        best_bid = price_data.get("best_bid", 0)
-        best_ask = price_data.get("best_ask", 0)
+        best_bid, best_ask = _best_bid_ask(message.payload)
         
-        if best_bid > 0 and best_ask < float('inf'):
+        if best_bid > 0 and best_ask < INF:
             mid_price = (best_bid + best_ask) / 2
-            self.price_history.append((timestamp, mid_price))
+            # Ring buffer overwrites the oldest price once max_history is reached
+            self.price_history.append(mid_price)
             
-            # Keep only recent history
-            if len(self.price_history) > self.max_history:
-                self.price_history.pop(0)
+            # History only grows, so the length check stops once warmed up
+            if not self._warmed:
+                if len(self.price_history) < self.min_history:
+                    return
+                self._warmed = True
             
             # Check for mean reversion signal
             self._check_mean_reversion_signal(mid_price)
     
-    def _update_fair_value(self, stats_data: dict):
+    def _update_fair_value(self, message: Message):
         """Update fair value based on market statistics"""
-        vwap = stats_data.get("vwap", self.fair_value)
+        stats_data = message.payload
+        vwap = stats_data["vwap"]
         if vwap > 0:
             self.fair_value = vwap
     
     def _check_mean_reversion_signal(self, current_price: float):
         """Check for mean reversion trading signals"""
-        if len(self.price_history) < 10:
-            return
-        
         # Calculate price deviation from fair value
         deviation = current_price - self.fair_value
         
@@ -72,19 +94,17 @@ class MeanReversionTraderAgent(ActiveAgent):
         if len(self.price_history) == 0:
             return
         
-        current_price = self.price_history[-1][1]
+        current_price = self.price_history[-1]
         order_size = 15
         
-        # Place limit order closer to fair value
-        limit_price = (current_price + self.fair_value) / 2
-        if side == "SELL":
-            limit_price = (current_price + self.fair_value) / 2
+        # Place limit order halfway to fair value, rounded to whole cents in one step
+        limit_price_ticks = round((current_price + self.fair_value) * 50)
             
         order = {
-            "order_id": f"{self.agent_id}_{side}_{int(round(limit_price * 100))}",
+            "order_id": self._order_prefixes[side] + str(next(self._order_seq)),
             "symbol": self.symbol,
             "side": side,
-            "price": round(limit_price, 2),
+            "price": limit_price_ticks / 100,
             "quantity": order_size
         }
-        self.send_message(f"{self.symbol}.ORDER", order)
\ No newline at end of file
+        self.send_message(self.order_topic, order)
\ No newline at end of file
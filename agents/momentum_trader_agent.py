@@ -1,59 +1,78 @@
 from typing import Dict, List, Tuple
 from core.agent import ActiveAgent
 from core.message import Message
-from utils.logger import setup_logger
+from orderbook.order_book import INF
+from utils.ring_buffer import RingBuffer
+import itertools
+import operator
 import random
+import sys
+
+
+# Reads both sides of a PRICE payload in one call
+_best_bid_ask = operator.itemgetter("best_bid", "best_ask")
 
 
 class MomentumTraderAgent(ActiveAgent):
     """Momentum trader that follows price trends"""
     
+    __slots__ = (
+        "symbol", "max_history", "price_history", "momentum_window", "_warmed", "position",
+        "max_position", "_order_prefixes", "_order_seq", "price_topic", "trade_topic",
+        "order_topic"
+    )
+    
     def __init__(self, agent_id: str, symbol: str):
         super().__init__(agent_id)
         self.symbol = symbol
-        self.price_history = []
         self.max_history = 10
+        self.price_history = RingBuffer(self.max_history)  # recent mid prices
+        self.momentum_window = 5  # prices needed for a momentum signal
+        self._warmed = False  # set once momentum_window prices have been seen
         self.position = 0
         self.max_position = 100
-        self.logger = setup_logger(f"MomentumTraderAgent.{agent_id}")
+        # Order IDs are a cached prefix plus a per-agent sequence number
+        self._order_prefixes = {
+            "BUY": f"{agent_id}_BUY_",
+            "SELL": f"{agent_id}_SELL_"
+        }
+        self._order_seq = itertools.count()
+        
+        # Topic strings are built once and reused for every message; inbound
+        # messages are dispatched to the handlers registered per topic
+        self.price_topic = sys.intern(f"{symbol}.PRICE")
+        self.trade_topic = sys.intern(f"{symbol}.TRADE")
+        self.order_topic = sys.intern(f"{symbol}.ORDER")
+        self.add_message_handler(self.price_topic, self._process_price_update)
+        self.add_message_handler(self.trade_topic, self._process_trade)
     
     def initialize(self):
         """Initialize subscriptions"""
-        self.subscribe(f"{self.symbol}.PRICE")
-        self.subscribe(f"{self.symbol}.TRADE")
-    
-    def receive_message(self, message: Message):
-        """Process incoming market data"""
-        if message.topic == f"{self.symbol}.PRICE":
-            self._process_price_update(message.payload, message.timestamp)
-        elif message.topic == f"{self.symbol}.TRADE":
-            self._process_trade(message.payload)
+        self.subscribe(self.price_topic)
+        self.subscribe(self.trade_topic)
     
-    def _process_price_update(self, price_data: dict, timestamp: int):
+    def _process_price_update(self, message: Message):
         """Process price updates and check for momentum signals"""
-        best_bid = price_data.get("best_bid", 0)
-        best_ask = price_data.get("best_ask", 0)
+        best_bid, best_ask = _best_bid_ask(message.payload)
         
-        if best_bid > 0 and best_ask < float('inf'):
+        if best_bid > 0 and best_ask < INF:
             mid_price = (best_bid + best_ask) / 2
-            self.price_history.append((timestamp, mid_price))
+            # Ring buffer overwrites the oldest price once max_history is reached
+            self.price_history.append(mid_price)
             
-            # Keep only recent history
-            if len(self.price_history) > self.max_history:
-                self.price_history.pop(0)
+            # History only grows, so the length check stops once warmed up
+            if not self._warmed:
+                if len(self.price_history) < self.momentum_window:
+                    return
+                self._warmed = True
             
             # Check for momentum signal
-            if len(self.price_history) >= 5:
-                self._check_momentum_signal()
+            self._check_momentum_signal()
     
     def _check_momentum_signal(self):
         """Check for momentum trading signals"""
-        if len(self.price_history) < 5:
-            return
-        
         # Simple momentum: check if price is trending up or down
-        recent_prices = [price for _, price in self.price_history[-5:]]
-        price_change = recent_prices[-1] - recent_prices[0]
+        price_change = self.price_history[-1] - self.price_history[-self.momentum_window]
         
         # Buy if strong upward momentum
         if price_change > 0.05 and self.position < self.max_position:
@@ -67,18 +86,18 @@ class MomentumTraderAgent(ActiveAgent):
         if len(self.price_history) == 0:
             return
         
-        current_price = self.price_history[-1][1]
+        current_price = self.price_history[-1]
         order_size = 10
         
         order = {
-            "order_id": f"{self.agent_id}_{side}_{int(round(current_price * 100))}",
+            "order_id": self._order_prefixes[side] + str(next(self._order_seq)),
             "symbol": self.symbol,
             "side": side,
             "price": current_price * (0.995 if side == "BUY" else 1.005),  # Limit order near market
             "quantity": order_size
         }
-        self.send_message(f"{self.symbol}.ORDER", order)
+        self.send_message(self.order_topic, order)
     
-    def _process_trade(self, trade_data: dict):
+    def _process_trade(self, message: Message):
         """Process trade executions to update position"""
         pass  # Implementation would track position changes
\ No newline at end of file
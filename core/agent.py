@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Set, Dict, Any
-from .message import Message, MessageBroker
+from typing import Set, Dict, Any, List, Callable, Tuple
+from .message import Message, MessageBroker, get_topic_id
 from utils.logger import setup_logger
 import logging
 
@@ -8,12 +8,19 @@ import logging
 class Agent(ABC):
     """Abstract base class for all agents in the simulation"""
     
+    __slots__ = (
+        "agent_id", "subscriptions", "message_broker", "kernel", "logger", "_message_handlers"
+    )
+    
     def __init__(self, agent_id: str):
         self.agent_id = agent_id
         self.subscriptions: Set[str] = set()
         self.message_broker: MessageBroker = None
         self.kernel = None
-        self.logger = setup_logger(f"Agent.{agent_id}")
+        # One logger per agent, named after the concrete class so subclasses need not replace it
+        self.logger = setup_logger(f"{type(self).__name__}.{agent_id}")
+        # Message handlers keyed by integer topic ID
+        self._message_handlers: Dict[int, Callable[[Message], None]] = {}
     
     def set_message_broker(self, broker: MessageBroker):
         """Set the message broker for this agent"""
@@ -30,6 +37,16 @@ class Agent(ABC):
         """Process incoming messages from subscribed topics"""
         pass
     
+    def add_message_handler(self, topic: str, handler: Callable[[Message], None]):
+        """Route messages on a topic to a handler"""
+        self._message_handlers[get_topic_id(topic)] = handler
+    
+    def dispatch_message(self, message: Message):
+        """Call the handler registered for the message's topic, if any"""
+        handler = self._message_handlers.get(message.topic_id)
+        if handler is not None:
+            handler(message)
+    
     def send_message(self, topic: str, payload: dict, timestamp: int = None):
         """Send message to a specific topic"""
         if self.message_broker is None:
@@ -38,12 +55,9 @@ class Agent(ABC):
         
         # Use current kernel time if timestamp not provided
         if timestamp is None:
-            if self.kernel is not None:
-                timestamp = self.kernel.get_current_time()
-            else:
-                timestamp = 0
+            timestamp = self._current_timestamp()
         
-        self.logger.debug(f"Sending message to topic {topic} with payload {payload}")
+        self.logger.debug("Sending message to topic %s with payload %s", topic, payload)
         
         message = Message(
             timestamp=timestamp,
@@ -53,13 +67,62 @@ class Agent(ABC):
         )
         self.message_broker.publish(message)
     
+    def send_messages(self, topic: str, payloads: List[dict], timestamp: int = None):
+        """Send a batch of messages to a specific topic with a single broker call"""
+        if not payloads:
+            return
+        
+        if self.message_broker is None:
+            self.logger.error("Message broker not set for agent")
+            raise RuntimeError("Message broker not set for agent")
+        
+        # Use current kernel time if timestamp not provided
+        if timestamp is None:
+            timestamp = self._current_timestamp()
+        
+        self.logger.debug("Sending %d messages to topic %s", len(payloads), topic)
+        
+        source_id = self.agent_id
+        messages = [
+            Message(timestamp=timestamp, topic=topic, payload=payload, source_id=source_id)
+            for payload in payloads
+        ]
+        self.message_broker.publish_batch(messages)
+    
+    def send_batch(self, messages: List[Tuple[str, dict]], timestamp: int = None):
+        """Send (topic, payload) pairs, possibly to different topics, with a single broker call"""
+        if not messages:
+            return
+        
+        if self.message_broker is None:
+            self.logger.error("Message broker not set for agent")
+            raise RuntimeError("Message broker not set for agent")
+        
+        # Use current kernel time if timestamp not provided
+        if timestamp is None:
+            timestamp = self._current_timestamp()
+        
+        self.logger.debug("Sending batch of %d messages", len(messages))
+        
+        source_id = self.agent_id
+        self.message_broker.publish_batch([
+            Message(timestamp=timestamp, topic=topic, payload=payload, source_id=source_id)
+            for topic, payload in messages
+        ])
+    
+    def _current_timestamp(self) -> int:
+        """Get the current kernel time, or 0 when no kernel is set"""
+        if self.kernel is not None:
+            return self.kernel.get_current_time()
+        return 0
+    
     def subscribe(self, topic_pattern: str):
         """Subscribe to messages from a topic or pattern"""
         if self.message_broker is None:
             self.logger.error("Message broker not set for agent")
             raise RuntimeError("Message broker not set for agent")
         
-        self.logger.debug(f"Subscribing to topic pattern: {topic_pattern}")
+        self.logger.debug("Subscribing to topic pattern: %s", topic_pattern)
         self.subscriptions.add(topic_pattern)
         self.message_broker.subscribe(self.agent_id, topic_pattern)
     
@@ -69,7 +132,7 @@ class Agent(ABC):
             self.logger.error("Message broker not set for agent")
             raise RuntimeError("Message broker not set for agent")
         
-        self.logger.debug(f"Unsubscribing from topic pattern: {topic_pattern}")
+        self.logger.debug("Unsubscribing from topic pattern: %s", topic_pattern)
         self.subscriptions.discard(topic_pattern)
         self.message_broker.unsubscribe(self.agent_id, topic_pattern)
 
@@ -77,33 +140,45 @@ class Agent(ABC):
 class PassiveAgent(Agent):
     """Agent that only responds to messages (no scheduled wakeups)"""
     
+    __slots__ = ()
+    
     def __init__(self, agent_id: str):
         super().__init__(agent_id)
     
     def receive_message(self, message: Message):
-        """Process incoming messages - to be implemented by subclasses"""
-        pass
+        """Process incoming messages with the registered topic handlers"""
+        self.dispatch_message(message)
 
 
 class ActiveAgent(Agent):
     """Agent that can be scheduled for regular wakeups"""
     
+    __slots__ = ("scheduled_wakeups",)
+    
     def __init__(self, agent_id: str):
         super().__init__(agent_id)
+        # Pending wakeup times; the kernel owns the actual schedule
         self.scheduled_wakeups: Set[int] = set()
     
     def receive_message(self, message: Message):
-        """Process incoming messages - to be implemented by subclasses"""
-        pass
+        """Process incoming messages with the registered topic handlers"""
+        self.dispatch_message(message)
+    
+    def set_kernel(self, kernel):
+        """Set reference to kernel and hand it any wakeups requested before registration"""
+        super().set_kernel(kernel)
+        for timestamp in sorted(self.scheduled_wakeups):
+            kernel.schedule_agent_wakeup(self.agent_id, timestamp)
     
     def schedule_wakeup(self, timestamp: int):
         """Request to be woken up at a specific time"""
         self.scheduled_wakeups.add(timestamp)
+        if self.kernel is not None:
+            self.kernel.schedule_agent_wakeup(self.agent_id, timestamp)
         return timestamp
     
     def wakeup(self, current_time: int):
         """Called by kernel at each scheduled time step"""
-        self.logger.debug(f"Waking up at time {current_time}")
+        self.logger.debug("Waking up at time %d", current_time)
         # Remove this wakeup time from scheduled wakeups
-        self.scheduled_wakeups.discard(current_time)
-        pass
\ No newline at end of file
+        self.scheduled_wakeups.discard(current_time)
\ No newline at end of file
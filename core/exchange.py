@@ -1,59 +1,90 @@
-from typing import Dict, List, Tuple
+import sys
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
 from .agent import ActiveAgent
 from .message import Message
-from orderbook.order_book import OrderBook, Order, Trade, MarketData
-from utils.logger import setup_logger
+from orderbook.order_book import OrderBook, Order, Trade, MarketData, INF, PRICE_SCALE
+
+
+# Sentinel price that marks a market order, by side
+_MARKET_ORDER_PRICES = {"BUY": INF, "SELL": 0.0}
 
 
 class ExchangeAgent(ActiveAgent):
     """Exchange agent responsible for maintaining order books and matching orders"""
     
-    def __init__(self, agent_id: str):
+    __slots__ = (
+        "order_books", "market_data", "trade_history", "trade_sink", "market_data_update_interval",
+        "_recent_trades", "_recent_volume", "_recent_value", "_topics",
+        "_last_snapshots", "_dirty_symbols"
+    )
+    
+    def __init__(self, agent_id: str, max_trade_history: int = 1_000_000):
         super().__init__(agent_id)
         self.order_books: Dict[str, OrderBook] = {}
         self.market_data: Dict[str, MarketData] = {}
-        self.trade_history: List[Trade] = []
+        # Most recent trades; older ones are handed to trade_sink, if set, as they drop out
+        self.trade_history: Deque[Trade] = deque(maxlen=max_trade_history)
+        self.trade_sink: Optional[Callable[[Trade], None]] = None
         self.market_data_update_interval = 100  # milliseconds
-        self.logger = setup_logger(f"ExchangeAgent.{agent_id}")
+        # Trades inside the statistics window, with running totals, per symbol
+        self._recent_trades: Dict[str, Deque[Tuple[int, int, float]]] = {}  # (timestamp, quantity, value)
+        self._recent_volume: Dict[str, int] = {}
+        self._recent_value: Dict[str, float] = {}
+        # Interned topic strings per symbol, keyed by topic suffix
+        self._topics: Dict[str, Dict[str, str]] = {}
+        # Last ORDERBOOK snapshot published per symbol
+        self._last_snapshots: Dict[str, dict] = {}
+        # Symbols whose book changed since market data was last flushed (ordered set)
+        self._dirty_symbols: Dict[str, None] = {}
+    
+    def set_kernel(self, kernel):
+        """Set reference to kernel and flush market data after each timestamp's deliveries"""
+        super().set_kernel(kernel)
+        kernel.add_delivery_hook(self._flush_market_data)
     
     def initialize_symbol(self, symbol: str):
         """Initialize an order book for a symbol"""
         if symbol not in self.order_books:
+            symbol = sys.intern(symbol)
+            self._topics[symbol] = {
+                suffix: sys.intern(f"{symbol}.{suffix}")
+                for suffix in ("ORDER", "CANCEL", "CANCEL_BATCH", "MARKET_DEPTH", "TRADE", "ORDERBOOK",
+                               "PRICE", "STATS", "CANCEL_CONFIRM", "CANCEL_BATCH_CONFIRM", "MARKET_DEPTH_RESPONSE")
+            }
             self.order_books[symbol] = OrderBook(symbol)
             self.market_data[symbol] = MarketData(
                 symbol=symbol,
                 timestamp=0,
                 best_bid=0.0,
-                best_ask=float('inf')
+                best_ask=INF
             )
-            # Subscribe to order messages for this symbol
-            self.subscribe(f"{symbol}.ORDER")
-            self.subscribe(f"{symbol}.CANCEL")
-            self.subscribe(f"{symbol}.MARKET_DEPTH")
-            # Schedule regular market data updates
-            self.schedule_wakeup(self.market_data_update_interval)
-    
-    def receive_message(self, message: Message):
-        """Process incoming messages"""
-        if message.topic.endswith(".ORDER"):
-            self._process_order(message)
-        elif message.topic.endswith(".CANCEL"):
-            self._process_cancel(message)
-        elif message.topic.endswith(".MARKET_DEPTH"):
-            self._process_market_depth_query(message)
-        else:
-            # Handle other message types
-            pass
+            self._recent_trades[symbol] = deque()
+            self._recent_volume[symbol] = 0
+            self._recent_value[symbol] = 0.0
+            # Subscribe to order messages for this symbol and route each topic to its handler
+            for suffix, handler in (
+                ("ORDER", self._process_order),
+                ("CANCEL", self._process_cancel),
+                ("CANCEL_BATCH", self._process_cancel_batch),
+                ("MARKET_DEPTH", self._process_market_depth_query)
+            ):
+                topic = self._topics[symbol][suffix]
+                self.add_message_handler(topic, handler)
+                self.subscribe(topic)
+            # Schedule regular market data updates; one wakeup chain covers every symbol
+            if len(self.order_books) == 1:
+                self.schedule_wakeup(self._current_timestamp() + self.market_data_update_interval)
     
     def _process_order(self, message: Message):
         """Process an order submission"""
         payload = message.payload
         symbol = payload.get("symbol")
         
-        self.logger.info(f"[{message.timestamp}ms] Exchange received order: {payload}")
+        self.logger.debug("[%dms] Exchange received order: %s", message.timestamp, payload)
         
         if symbol not in self.order_books:
-            self.logger.debug(f"Initializing symbol {symbol}")
+            self.logger.debug("Initializing symbol %s", symbol)
             self.initialize_symbol(symbol)
         
         # Create order object
@@ -68,24 +99,33 @@ class ExchangeAgent(ActiveAgent):
         )
         
         # Determine if it's a market order (price is infinity for buy or 0 for sell)
-        is_market_order = (order.side == "BUY" and order.price == float('inf')) or \
-                           (order.side == "SELL" and order.price == 0.0)
+        is_market_order = order.price == _MARKET_ORDER_PRICES[order.side]
         
         # Add order to book and get any trades
         if is_market_order:
             # For market orders, check liquidity with default 80% fill requirement
             can_fill, trades = self.order_books[symbol].add_market_order(order, min_fill_percent=0.8)
             if not can_fill:
-                self.logger.info(f"Market order {order.order_id} rejected due to insufficient liquidity")
+                self.logger.info("Market order %s rejected due to insufficient liquidity", order.order_id)
                 return
         else:
+            # Snap the limit price to the tick grid so equal prices always share one book level
+            order.price = round(order.price * PRICE_SCALE) / PRICE_SCALE
+            
             # For limit orders, optionally execute partial market if overlapping with orderbook levels
             # This is controlled by a flag, defaulting to False to maintain backward compatibility
             trades = self.order_books[symbol].add_limit_order(order, execute_partial_market=False)
         
-        self.logger.info(f"Order added, {len(trades)} trades generated")
+        self.logger.debug("Order added, %s trades generated", len(trades))
+        
+        # Collect the trade messages and publish them with one broker call
+        timestamp = message.timestamp
+        outbox = []
         
         # Process trades
+        recent_trades = self._recent_trades[symbol]
+        trade_topic = self._topics[symbol]["TRADE"]
+        trade_history = self.trade_history
         for trade_id, price, quantity, buyer_id, seller_id in trades:
             trade = Trade(
                 trade_id=trade_id,
@@ -94,38 +134,30 @@ class ExchangeAgent(ActiveAgent):
                 quantity=quantity,
                 buyer_id=buyer_id,
                 seller_id=seller_id,
-                timestamp=message.timestamp
+                timestamp=timestamp
             )
             
-            self.trade_history.append(trade)
+            if self.trade_sink is not None and len(trade_history) == trade_history.maxlen:
+                self.trade_sink(trade_history[0])
+            trade_history.append(trade)
+            value = price * quantity
+            recent_trades.append((timestamp, quantity, value))
+            self._recent_volume[symbol] += quantity
+            self._recent_value[symbol] += value
             
             # Publish trade execution
-            trade_message = Message(
-                timestamp=message.timestamp,
-                topic=f"{symbol}.TRADE",
-                payload={
-                    "trade_id": trade_id,
-                    "price": price,
-                    "quantity": quantity,
-                    "buyer_id": buyer_id,
-                    "seller_id": seller_id
-                },
-                source_id=self.agent_id
-            )
-            self.send_message(trade_message.topic, trade_message.payload, trade_message.timestamp)
+            outbox.append((trade_topic, {
+                "trade_id": trade_id,
+                "price": price,
+                "quantity": quantity,
+                "buyer_id": buyer_id,
+                "seller_id": seller_id
+            }))
         
-        # Update market data
-        self._update_market_data(symbol, message.timestamp)
+        self.send_batch(outbox, timestamp)
         
-        # Publish order book update
-        orderbook_update = self.order_books[symbol].get_order_book_snapshot()
-        orderbook_message = Message(
-            timestamp=message.timestamp,
-            topic=f"{symbol}.ORDERBOOK",
-            payload=orderbook_update,
-            source_id=self.agent_id
-        )
-        self.send_message(orderbook_message.topic, orderbook_message.payload, orderbook_message.timestamp)
+        # Update market data
+        self._update_market_data(symbol, timestamp)
     
     def _process_cancel(self, message: Message):
         """Process an order cancellation"""
@@ -137,42 +169,79 @@ class ExchangeAgent(ActiveAgent):
             cancelled = self.order_books[symbol].cancel_order(order_id)
             if cancelled:
                 # Publish cancellation confirmation
-                cancel_message = Message(
-                    timestamp=message.timestamp,
-                    topic=f"{symbol}.CANCEL_CONFIRM",
-                    payload={
-                        "order_id": order_id,
-                        "cancelled": True
-                    },
-                    source_id=self.agent_id
-                )
-                self.send_message(cancel_message.topic, cancel_message.payload, cancel_message.timestamp)
+                self.send_message(self._topics[symbol]["CANCEL_CONFIRM"], {
+                    "order_id": order_id,
+                    "cancelled": True
+                }, message.timestamp)
                 
                 # Update market data
                 self._update_market_data(symbol, message.timestamp)
     
+    def _process_cancel_batch(self, message: Message):
+        """Process a batch of order cancellations for one symbol"""
+        payload = message.payload
+        symbol = payload.get("symbol")
+        
+        if symbol not in self.order_books:
+            return
+        
+        order_book = self.order_books[symbol]
+        cancelled_ids = [
+            order_id for order_id in payload.get("order_ids", [])
+            if order_book.cancel_order(order_id)
+        ]
+        
+        if cancelled_ids:
+            # Publish a single confirmation for every cancelled order
+            self.send_message(self._topics[symbol]["CANCEL_BATCH_CONFIRM"], {
+                "order_ids": cancelled_ids,
+                "cancelled": True
+            }, message.timestamp)
+            
+            # Update market data once for the whole batch
+            self._update_market_data(symbol, message.timestamp)
+    
     def _update_market_data(self, symbol: str, timestamp: int):
-        """Update market data for a symbol"""
+        """Mark a symbol's market data as changed; it is published once per timestamp"""
         if symbol in self.order_books and symbol in self.market_data:
-            order_book = self.order_books[symbol]
-            market_data = self.market_data[symbol]
-            
-            market_data.timestamp = timestamp
-            market_data.best_bid = order_book.best_bid
-            market_data.best_ask = order_book.best_ask
+            self._dirty_symbols[symbol] = None
+    
+    def _flush_market_data(self, timestamp: int):
+        """Publish one PRICE and ORDERBOOK update for every symbol changed at this timestamp"""
+        if not self._dirty_symbols:
+            return
+        
+        outbox = []
+        for symbol in self._dirty_symbols:
+            price_update = self._refresh_market_data(symbol, timestamp)
+            if price_update is not None:
+                outbox.append(price_update)
             
-            # Publish price update
-            price_message = Message(
-                timestamp=timestamp,
-                topic=f"{symbol}.PRICE",
-                payload={
-                    "best_bid": market_data.best_bid,
-                    "best_ask": market_data.best_ask,
-                    "spread": market_data.best_ask - market_data.best_bid if market_data.best_ask != float('inf') else 0
-                },
-                source_id=self.agent_id
-            )
-            self.send_message(price_message.topic, price_message.payload, price_message.timestamp)
+            # Publish order book update, unless the visible depth is unchanged
+            snapshot = self.order_books[symbol].get_order_book_snapshot()
+            if snapshot != self._last_snapshots.get(symbol):
+                self._last_snapshots[symbol] = snapshot
+                outbox.append((self._topics[symbol]["ORDERBOOK"], snapshot))
+        self._dirty_symbols.clear()
+        
+        self.send_batch(outbox, timestamp)
+    
+    def _refresh_market_data(self, symbol: str, timestamp: int) -> Optional[Tuple[str, dict]]:
+        """Refresh a symbol's market data from its order book and build the PRICE update, if the top of book moved"""
+        order_book = self.order_books[symbol]
+        market_data = self.market_data[symbol]
+        
+        market_data.timestamp = timestamp
+        if market_data.best_bid == order_book.best_bid and market_data.best_ask == order_book.best_ask:
+            return None
+        market_data.best_bid = order_book.best_bid
+        market_data.best_ask = order_book.best_ask
+        
+        return self._topics[symbol]["PRICE"], {
+            "best_bid": market_data.best_bid,
+            "best_ask": market_data.best_ask,
+            "spread": market_data.best_ask - market_data.best_bid if market_data.best_ask != INF else 0
+        }
     
     def _process_market_depth_query(self, message: Message):
         """Process market depth queries from agents"""
@@ -181,11 +250,11 @@ class ExchangeAgent(ActiveAgent):
         query_type = payload.get("query_type")
         
         if symbol not in self.order_books:
-            self.logger.warning(f"Market depth query for unknown symbol: {symbol}")
+            self.logger.warning("Market depth query for unknown symbol: %s", symbol)
             return
         
         order_book = self.order_books[symbol]
-        response_topic = f"{symbol}.MARKET_DEPTH_RESPONSE"
+        response_topic = self._topics[symbol]["MARKET_DEPTH_RESPONSE"]
         response_payload = {"query_type": query_type}
         
         if query_type == "get_market_depth":
@@ -244,28 +313,32 @@ class ExchangeAgent(ActiveAgent):
     
     def _publish_market_statistics(self, timestamp: int):
         """Publish market statistics"""
+        cutoff = timestamp - self.market_data_update_interval
+        outbox = []
         for symbol, market_data in self.market_data.items():
-            # Calculate volume and VWAP from recent trades
-            recent_trades = [
-                trade for trade in self.trade_history 
-                if trade.timestamp >= timestamp - self.market_data_update_interval and trade.symbol == symbol
-            ]
+            # Drop trades that have left the window and take them out of the totals
+            recent_trades = self._recent_trades[symbol]
+            total_volume = self._recent_volume[symbol]
+            total_value = self._recent_value[symbol]
+            while recent_trades and recent_trades[0][0] < cutoff:
+                _, quantity, value = recent_trades.popleft()
+                total_volume -= quantity
+                total_value -= value
+            if not recent_trades:
+                # Reset so rounding error cannot carry over an empty window
+                total_value = 0.0
+            self._recent_volume[symbol] = total_volume
+            self._recent_value[symbol] = total_value
             
-            total_volume = sum(trade.quantity for trade in recent_trades)
             vwap = 0.0
             if total_volume > 0:
-                total_value = sum(trade.price * trade.quantity for trade in recent_trades)
                 vwap = total_value / total_volume
             
-            stats_message = Message(
-                timestamp=timestamp,
-                topic=f"{symbol}.STATS",
-                payload={
-                    "volume": total_volume,
-                    "vwap": vwap,
-                    "best_bid": market_data.best_bid,
-                    "best_ask": market_data.best_ask
-                },
-                source_id=self.agent_id
-            )
-            self.send_message(stats_message.topic, stats_message.payload, stats_message.timestamp)
\ No newline at end of file
+            outbox.append((self._topics[symbol]["STATS"], {
+                "volume": total_volume,
+                "vwap": vwap,
+                "best_bid": market_data.best_bid,
+                "best_ask": market_data.best_ask
+            }))
+        
+        self.send_batch(outbox, timestamp)
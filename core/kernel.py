@@ -1,5 +1,5 @@
-import heapq
-from typing import Dict, Set, List, Tuple
+from typing import Callable, Dict, List
+from sortedcontainers import SortedDict
 from .agent import Agent, ActiveAgent
 from .message import MessageBroker
 from utils.logger import setup_logger
@@ -11,42 +11,54 @@ class Kernel:
     def __init__(self):
         self.current_time = 0  # milliseconds since simulation start
         self.end_time = 0      # simulation end time
-        self.event_queue = []  # priority queue: (timestamp, agent_id, event_type)
+        # timestamp -> {(agent_id, event_type): None}, an ordered set of the events due then
+        self.events: SortedDict = SortedDict()
         self.message_broker = MessageBroker()
         self.agents: Dict[str, Agent] = {}
-        self.agent_wakeups: Dict[int, Set[str]] = {}  # timestamp -> agent_ids
+        # Bound wakeup methods of registered active agents
+        self._wakeup_callbacks: Dict[str, Callable[[int], None]] = {}
+        # Callbacks run once a timestamp's messages have been delivered
+        self._delivery_hooks: List[Callable[[int], None]] = []
         self.logger = setup_logger("Kernel")
     
     def register_agent(self, agent: Agent):
         """Register an agent with the kernel"""
         self.agents[agent.agent_id] = agent
+        if isinstance(agent, ActiveAgent):
+            self._wakeup_callbacks[agent.agent_id] = agent.wakeup
+        else:
+            self._wakeup_callbacks.pop(agent.agent_id, None)
         agent.set_message_broker(self.message_broker)
         agent.set_kernel(self)
     
+    def add_delivery_hook(self, hook: Callable[[int], None]):
+        """Register a callback run after each timestamp's messages are delivered, before wakeups"""
+        self._delivery_hooks.append(hook)
+    
     def schedule_event(self, timestamp: int, agent_id: str, event_type: str = "wakeup"):
         """Schedule an agent wakeup or system event"""
         if timestamp < self.current_time:
             raise ValueError("Cannot schedule events in the past")
         
-        heapq.heappush(self.event_queue, (timestamp, agent_id, event_type))
-        
-        # Track wakeups for active agents
-        if event_type == "wakeup":
-            if timestamp not in self.agent_wakeups:
-                self.agent_wakeups[timestamp] = set()
-            self.agent_wakeups[timestamp].add(agent_id)
+        # All events sharing a timestamp go into one bucket; repeating an event
+        # for the same agent at the same time is a no-op
+        bucket = self.events.get(timestamp)
+        if bucket is None:
+            self.events[timestamp] = {(agent_id, event_type): None}
+        else:
+            bucket[(agent_id, event_type)] = None
     
     def run(self, end_time: int):
         """Run simulation until end_time"""
-        self.logger.info(f"Starting simulation run for {end_time}ms")
+        self.logger.info("Starting simulation run for %dms", end_time)
         self.end_time = end_time
         self.current_time = 0
         
         # Process events until end time
         while self.current_time < self.end_time:
-            if self.event_queue:
+            if self.events:
                 # Get the next event timestamp
-                next_timestamp = self.event_queue[0][0]
+                next_timestamp = self.events.peekitem(0)[0]
                 
                 # Make sure we don't go past end time
                 if next_timestamp > self.end_time:
@@ -54,7 +66,7 @@ class Kernel:
                 
                 # Advance time to next event
                 self.current_time = next_timestamp
-                self.logger.debug(f"Processing events at timestamp {self.current_time}")
+                self.logger.debug("Processing events at timestamp %s", self.current_time)
                 
                 # Process all events at this timestamp
                 self._process_events_at_timestamp(next_timestamp)
@@ -64,30 +76,27 @@ class Kernel:
         
         # Deliver any remaining messages
         self.message_broker.deliver_messages(self.current_time)
+        for hook in self._delivery_hooks:
+            hook(self.current_time)
         self.logger.info("Simulation run completed")
     
     def _process_events_at_timestamp(self, timestamp: int):
         """Process all events scheduled for a specific timestamp"""
-        # Collect all events at this timestamp
-        events_at_timestamp = []
-        while self.event_queue and self.event_queue[0][0] == timestamp:
-            event = heapq.heappop(self.event_queue)
-            events_at_timestamp.append(event)
+        # Take the whole bucket; events scheduled from here on for this timestamp start a new one
+        events_at_timestamp = self.events.pop(timestamp, {})
         
         # Deliver messages first
         self.message_broker.deliver_messages(timestamp)
+        for hook in self._delivery_hooks:
+            hook(timestamp)
         
-        # Then wake up agents
-        agent_wakeups = self.agent_wakeups.get(timestamp, set())
-        for agent_id in agent_wakeups:
-            if agent_id in self.agents:
-                agent = self.agents[agent_id]
-                if isinstance(agent, ActiveAgent):
-                    agent.wakeup(timestamp)
-        
-        # Clean up processed wakeups
-        if timestamp in self.agent_wakeups:
-            del self.agent_wakeups[timestamp]
+        # Then wake up agents in the order their wakeups were scheduled
+        wakeup_callbacks = self._wakeup_callbacks
+        for agent_id, event_type in events_at_timestamp:
+            if event_type == "wakeup":
+                wakeup = wakeup_callbacks.get(agent_id)
+                if wakeup is not None:
+                    wakeup(timestamp)
     
     def get_current_time(self) -> int:
         """Get the current simulation time in milliseconds"""
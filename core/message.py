@@ -1,43 +1,47 @@
 import heapq
-from typing import Dict, List, Set, Any, Callable
+import itertools
+import logging
+from collections import defaultdict
+from typing import Dict, List, Set, Any, Callable, Tuple
 from dataclasses import dataclass, field
+from functools import total_ordering
 from datetime import datetime
-import uuid
 from utils.logger import setup_logger
 
 
-@dataclass
+# Process-wide topic registry: topic -> small integer ID
+_topic_ids: Dict[str, int] = {}
+
+# Process-wide source of message IDs, in creation order
+_message_ids = itertools.count()
+
+
+def get_topic_id(topic: str) -> int:
+    """Get the integer ID of a topic, assigning the next free ID on first use"""
+    topic_id = _topic_ids.get(topic)
+    if topic_id is None:
+        topic_id = _topic_ids[topic] = len(_topic_ids)
+    return topic_id
+
+
+@total_ordering
+@dataclass(slots=True)
 class Message:
     """Base message class for inter-agent communication"""
     timestamp: int  # milliseconds since simulation start
     topic: str      # topic identifier
     payload: dict   # message content
     source_id: str  # sending agent ID
-    message_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    
-    def __lt__(self, other):
-        """Enable comparison for heap operations"""
-        if self.timestamp != other.timestamp:
-            return self.timestamp < other.timestamp
-        return self.message_id < other.message_id
-    
-    def __le__(self, other):
-        """Enable comparison for heap operations"""
-        if self.timestamp != other.timestamp:
-            return self.timestamp <= other.timestamp
-        return self.message_id <= other.message_id
+    message_id: int = field(default_factory=_message_ids.__next__)
+    topic_id: int = field(init=False, compare=False)  # integer ID of the topic
     
-    def __gt__(self, other):
-        """Enable comparison for heap operations"""
-        if self.timestamp != other.timestamp:
-            return self.timestamp > other.timestamp
-        return self.message_id > other.message_id
+    def __post_init__(self):
+        # Resolve the topic once so receivers can dispatch on an int
+        self.topic_id = get_topic_id(self.topic)
     
-    def __ge__(self, other):
-        """Enable comparison for heap operations"""
-        if self.timestamp != other.timestamp:
-            return self.timestamp >= other.timestamp
-        return self.message_id >= other.message_id
+    def __lt__(self, other):
+        """Order by timestamp, then creation order; the other comparisons derive from this"""
+        return (self.timestamp, self.message_id) < (other.timestamp, other.message_id)
 
 
 class MessageBroker:
@@ -48,14 +52,18 @@ class MessageBroker:
         self.subscriptions: Dict[str, Set[str]] = {}
         # Wildcard subscriptions: pattern -> set of agent IDs
         self.wildcard_subscriptions: Dict[str, Set[str]] = {}
-        # Message queue ordered by timestamp
-        self.message_queue: List[tuple] = []  # (timestamp, message)
+        # Resolved recipients per topic ID, cleared whenever subscriptions change
+        self._recipient_cache: Dict[int, Tuple[str, ...]] = {}
+        # Message queue ordered by timestamp, ties broken by publish order
+        self.message_queue: List[tuple] = []  # (timestamp, sequence, message)
+        self._sequence = itertools.count()
         # Agent message handlers
         self.agent_handlers: Dict[str, Callable] = {}
         self.logger = setup_logger("MessageBroker")
     
     def subscribe(self, agent_id: str, topic_pattern: str):
         """Subscribe an agent to a topic or pattern"""
+        self._recipient_cache.clear()
         if "*" in topic_pattern:
             # Handle wildcard patterns
             if topic_pattern not in self.wildcard_subscriptions:
@@ -69,6 +77,7 @@ class MessageBroker:
     
     def unsubscribe(self, agent_id: str, topic_pattern: str):
         """Unsubscribe an agent from a topic or pattern"""
+        self._recipient_cache.clear()
         if "*" in topic_pattern:
             if topic_pattern in self.wildcard_subscriptions:
                 self.wildcard_subscriptions[topic_pattern].discard(agent_id)
@@ -78,8 +87,18 @@ class MessageBroker:
     
     def publish(self, message: Message):
         """Publish a message to all subscribed agents"""
-        self.logger.debug(f"Publishing message to topic {message.topic}")
-        heapq.heappush(self.message_queue, (message.timestamp, message))
+        self.logger.debug("Publishing message to topic %s", message.topic)
+        # The sequence number keeps heap comparisons on native ints and never
+        # falls through to Message.__lt__
+        heapq.heappush(self.message_queue, (message.timestamp, next(self._sequence), message))
+    
+    def publish_batch(self, messages: List[Message]):
+        """Publish several messages, preserving their order for equal timestamps"""
+        self.logger.debug("Publishing batch of %s messages", len(messages))
+        queue = self.message_queue
+        sequence = self._sequence
+        for message in messages:
+            heapq.heappush(queue, (message.timestamp, next(sequence), message))
     
     def register_agent_handler(self, agent_id: str, handler: Callable):
         """Register an agent's message handling function"""
@@ -88,37 +107,53 @@ class MessageBroker:
     def get_messages_for_timestamp(self, timestamp: int) -> List[Message]:
         """Get all messages scheduled for a specific timestamp"""
         messages = []
-        while self.message_queue and self.message_queue[0][0] <= timestamp:
-            _, message = heapq.heappop(self.message_queue)
-            messages.append(message)
+        queue = self.message_queue
+        heappop = heapq.heappop
+        append = messages.append
+        while queue and queue[0][0] <= timestamp:
+            append(heappop(queue)[2])
         return messages
     
     def deliver_messages(self, timestamp: int):
         """Deliver all messages scheduled for the current timestamp"""
         messages = self.get_messages_for_timestamp(timestamp)
-        self.logger.debug(f"Delivering {len(messages)} messages at timestamp {timestamp}")
+        if not messages:
+            return
+        # Checked once per call rather than once per recipient
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug("Delivering %s messages at timestamp %s", len(messages), timestamp)
         
         # Group messages by recipient for batch delivery
-        recipient_messages: Dict[str, List[Message]] = {}
+        recipient_messages: Dict[str, List[Message]] = defaultdict(list)
+        recipient_cache = self._recipient_cache
         
         for message in messages:
-            # Find all agents subscribed to this message's topic
-            recipients = self._find_recipients(message.topic)
+            # Find all agents subscribed to this message's topic, by its integer ID
+            recipients = recipient_cache.get(message.topic_id)
+            if recipients is None:
+                recipients = self._find_recipients(message.topic)
             
             for recipient_id in recipients:
-                if recipient_id not in recipient_messages:
-                    recipient_messages[recipient_id] = []
                 recipient_messages[recipient_id].append(message)
         
         # Deliver messages to each recipient
+        handlers_get = self.agent_handlers.get
         for recipient_id, msgs in recipient_messages.items():
-            if recipient_id in self.agent_handlers:
-                self.logger.debug(f"Delivering {len(msgs)} messages to agent {recipient_id}")
+            handler = handlers_get(recipient_id)
+            if handler is not None:
+                if debug:
+                    self.logger.debug("Delivering %s messages to agent %s", len(msgs), recipient_id)
                 for message in msgs:
-                    self.agent_handlers[recipient_id](message)
+                    handler(message)
     
-    def _find_recipients(self, topic: str) -> Set[str]:
+    def _find_recipients(self, topic: str) -> Tuple[str, ...]:
         """Find all agents subscribed to a topic (including wildcards)"""
+        topic_id = get_topic_id(topic)
+        cached = self._recipient_cache.get(topic_id)
+        if cached is not None:
+            return cached
+        
         recipients = set()
         
         # Exact matches
@@ -130,7 +165,9 @@ class MessageBroker:
             if self._matches_pattern(topic, pattern):
                 recipients.update(agents)
         
-        return recipients
+        # Sorted so delivery order does not depend on string hashing
+        cached = self._recipient_cache[topic_id] = tuple(sorted(recipients))
+        return cached
     
     def _matches_pattern(self, topic: str, pattern: str) -> bool:
         """Check if a topic matches a wildcard pattern"""
@@ -2,6 +2,7 @@ from core.kernel import Kernel
 from core.exchange import ExchangeAgent
 from agents import MarketMakerAgent, MomentumTraderAgent, MeanReversionTraderAgent, LiquidityProviderAgent
 from utils.logger import setup_logger
+import gc
 import random
 import logging
 
@@ -46,6 +47,10 @@ def main():
     # kernel.schedule_agent_wakeup("MR_1", 3000)
     kernel.schedule_agent_wakeup("LP_1", 500)
     
+    # Agents, books and topic tables live for the whole run; keep the garbage
+    # collector from rescanning them during the simulation
+    gc.freeze()
+    
     # Run simulation for 10 seconds (10000 milliseconds)
     logger.info("Starting market simulation...")
     kernel.run(10000)
@@ -57,7 +62,7 @@ def main():
     logger.info(f"Order book size: {len(exchange.order_books['AAPL'].bids) + len(exchange.order_books['AAPL'].asks)} levels")
     
     if exchange.trade_history:
-        last_trades = exchange.trade_history[-5:]  # Last 5 trades
+        last_trades = list(exchange.trade_history)[-5:]  # Last 5 trades
         logger.info("Last 5 trades:")
         for trade in last_trades:
             logger.info(f"  {trade.trade_id}: {trade.quantity} @ ${trade.price}")
@@ -4,11 +4,12 @@ Example demonstrating how to use the order book depth checking functionality
 in any trading agent.
 """
 
-from agents.trading_agents import MarketMakerAgent, MomentumTraderAgent
+from agents import MarketMakerAgent, MomentumTraderAgent
 from core.exchange import ExchangeAgent
 from core.kernel import Kernel
-from core.message import Message, MessageBroker
+from core.message import MessageBroker
 from orderbook.order_book_utils import OrderBookDepthChecker
+import sys
 import time
 
 
@@ -19,6 +20,7 @@ class SmartTraderAgent(MomentumTraderAgent):
         super().__init__(agent_id, symbol)
         self.depth_checker = None
         self.safe_order_placer = None
+        self.depth_response_topic = sys.intern(f"{symbol}.MARKET_DEPTH_RESPONSE")
     
     def initialize(self):
         """Initialize the agent and order book utilities"""
@@ -27,16 +29,9 @@ class SmartTraderAgent(MomentumTraderAgent):
         # Initialize order book depth checking utilities
         self.depth_checker = OrderBookDepthChecker(self, self.symbol)
         
-        # Subscribe to market depth responses
-        self.subscribe(f"{self.symbol}.MARKET_DEPTH_RESPONSE")
-    
-    def receive_message(self, message: Message):
-        """Process incoming messages"""
-        super().receive_message(message)
-        
-        # Handle market depth responses
-        if message.topic == f"{self.symbol}.MARKET_DEPTH_RESPONSE":
-            self.depth_checker.handle_market_depth_response(message)
+        # Subscribe to market depth responses; they are dispatched with the agent's other topics
+        self.add_message_handler(self.depth_response_topic, self.depth_checker.handle_market_depth_response)
+        self.subscribe(self.depth_response_topic)
     
     def check_liquidity_before_trading(self):
         """Example of checking liquidity before placing an order"""
@@ -75,7 +70,7 @@ class SmartTraderAgent(MomentumTraderAgent):
             "price": float('inf') if side == 'BUY' else 0.0,  # Market order
             "quantity": quantity
         }
-        self.send_message(f"{self.symbol}.ORDER", order)
+        self.send_message(self.order_topic, order)
         self.logger.info(f"Placed market {side} order for {quantity} shares (liquidity check in OrderBook)")
     
     def get_market_spread(self):
@@ -1,11 +1,20 @@
 from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from sortedcontainers import SortedDict
-import heapq
+from itertools import count, islice
+import operator
 from utils.logger import setup_logger
 
+# Empty-ask sentinel and market BUY order price
+INF = float('inf')
+# Price ticks per unit; limit prices are snapped to this grid by the exchange
+PRICE_SCALE = 10_000
+# Valid order sides
+_SIDES = frozenset(("BUY", "SELL"))
 
-@dataclass
+
+@dataclass(slots=True)
 class Order:
     """Represents a single order in the order book"""
     order_id: str
@@ -17,16 +26,17 @@ class Order:
     timestamp: int
     
     def __post_init__(self):
-        if self.side not in ["BUY", "SELL"]:
+        if self.side not in _SIDES:
             raise ValueError("Side must be 'BUY' or 'SELL'")
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderBookLevel:
     """Represents a price level in the order book"""
     price: float
     quantity: int = 0
-    orders: List[Order] = field(default_factory=list)
+    # Resting orders in time priority, keyed by order ID for O(1) cancels
+    orders: Dict[str, Order] = field(default_factory=OrderedDict)
 
 
 class OrderBook:
@@ -35,107 +45,85 @@ class OrderBook:
     def __init__(self, symbol: str):
         self.symbol = symbol
         # Bids sorted in descending order (highest price first)
-        self.bids = SortedDict(lambda x: -x)  # price -> OrderBookLevel
+        # operator.neg is a C-level key, so inserting a level makes no Python-level call
+        self.bids = SortedDict(operator.neg)  # price -> OrderBookLevel
         # Asks sorted in ascending order (lowest price first)
         self.asks = SortedDict()  # price -> OrderBookLevel
         self.best_bid = 0.0
-        self.best_ask = float('inf')
+        self.best_ask = INF
+        # Running sums of level quantities per side, kept in step with every level change
+        self.total_bid_qty = 0
+        self.total_ask_qty = 0
         self.order_map: Dict[str, Order] = {}  # order_id -> Order
+        # Trade IDs, increasing in execution order within this book
+        self._trade_ids = count(1)
         self.logger = setup_logger(f"OrderBook.{symbol}")
     
     def add_limit_order(self, order: Order, execute_partial_market: bool = False,
-                       min_fill_percent: float = 0.8) -> List[Tuple[str, float, int, str, str]]:
+                       min_fill_percent: float = 0.8) -> List[Tuple[int, float, int, str, str]]:
         """Add a limit order to the book and return any trades generated.
         
+        The order is matched against the opposite side first and only the unfilled
+        remainder rests in the book, so the crossing part of an order always executes.
+        
         Args:
             order: The limit order to add
-            execute_partial_market: If True, execute part of the order as market when price overlaps
-                                  with existing orderbook levels
-            min_fill_percent: Minimum percentage of order that must be fillable for market-like execution
+            execute_partial_market: Kept for compatibility; the crossing part of an order
+                                  is always executed before the remainder rests
+            min_fill_percent: Unused, kept for compatibility
             
         Returns:
             List of trades generated from the order
         """
-        self.logger.debug(f"Adding limit order {order.order_id}: {order.side} {order.quantity} @ {order.price}")
+        self.logger.debug("Adding limit order %s: %s %s @ %s", order.order_id, order.side, order.quantity, order.price)
         
-        trades = []
-        
-        # If execute_partial_market is enabled, check if we can execute part of the order as market
-        if execute_partial_market:
-            # Check if there's liquidity at the exact price level
-            liquidity_at_price = 0
-            if order.side == "BUY":
-                # For buy orders, check asks at the same price
-                if order.price in self.asks:
-                    liquidity_at_price = self.asks[order.price].quantity
-            else:  # SELL
-                # For sell orders, check bids at the same price
-                if order.price in self.bids:
-                    liquidity_at_price = self.bids[order.price].quantity
-            
-            # If there's liquidity at this price level, execute part of the order as market
-            if liquidity_at_price > 0:
-                # Create a temporary order with the quantity that can be filled at this price
-                fillable_quantity = min(order.quantity, liquidity_at_price)
-                market_like_order = Order(
-                    order_id=f"{order.order_id}_MARKET_PART",
-                    agent_id=order.agent_id,
-                    symbol=order.symbol,
-                    side=order.side,
-                    price=order.price,  # This will be ignored for matching but used for price reference
-                    quantity=fillable_quantity,
-                    timestamp=order.timestamp
-                )
-                
-                # Execute this portion as a market-like order
-                market_trades = self._match_order(market_like_order)
-                trades.extend(market_trades)
-                
-                # Update the original order quantity
-                order.quantity -= fillable_quantity
-                
-                self.logger.debug(f"Executed {fillable_quantity} units of limit order {order.order_id} as market-like trade")
+        # Match against the opposite side only while the order can cross it
+        if order.side == "BUY":
+            crosses = order.price >= self.best_ask
+        else:  # SELL
+            crosses = order.price <= self.best_bid
+        trades = self._match_order(order) if crosses else []
         
-        # If there's still quantity left, add it as a regular limit order
+        # If there's still quantity left, rest it as a regular limit order
         if order.quantity > 0:
             # Store order for later lookup
             self.order_map[order.order_id] = order
             
-            # Get or create the price level
+            # Get or create the price level; the best price only moves if this order improves it
             if order.side == "BUY":
                 if order.price not in self.bids:
                     self.bids[order.price] = OrderBookLevel(order.price)
                 level = self.bids[order.price]
+                if order.price > self.best_bid:
+                    self.best_bid = order.price
+                self.total_bid_qty += order.quantity
             else:  # SELL
                 if order.price not in self.asks:
                     self.asks[order.price] = OrderBookLevel(order.price)
                 level = self.asks[order.price]
+                if order.price < self.best_ask:
+                    self.best_ask = order.price
+                self.total_ask_qty += order.quantity
             
             # Add order to the level
-            level.orders.append(order)
+            level.orders[order.order_id] = order
             level.quantity += order.quantity
             
-            # Update best prices
-            self._update_best_prices()
-            
-            # Try to match the remaining order
-            remaining_trades = self._match_order(order)
-            trades.extend(remaining_trades)
-            
         if trades:
-            self.logger.debug(f"Generated {len(trades)} trades for limit order {order.order_id}")
+            self.logger.debug("Generated %s trades for limit order %s", len(trades), order.order_id)
         return trades
     
-    def add_market_order(self, order: Order, min_fill_percent: float = 1.0) -> Tuple[bool, List[Tuple[str, float, int, str, str]]]:
+    def add_market_order(self, order: Order, min_fill_percent: float = 1.0) -> Tuple[bool, List[Tuple[int, float, int, str, str]]]:
         """Add a market order to the book after checking liquidity and return (can_fill, trades)"""
-        self.logger.debug(f"Adding market order {order.order_id}: {order.side} {order.quantity}")
+        self.logger.debug("Adding market order %s: %s %s", order.order_id, order.side, order.quantity)
         
         # Check if we can fill the order with sufficient liquidity
         can_fill, actual_fill_percent = self.can_fill_order(order.side, order.quantity, min_fill_percent)
         
         if not can_fill:
-            self.logger.debug(f"Market order {order.order_id} rejected due to insufficient liquidity "
-                               f"(fill percent: {actual_fill_percent:.2%}, min required: {min_fill_percent:.2%})")
+            self.logger.debug("Market order %s rejected due to insufficient liquidity "
+                              "(fill percent: %.2f%%, min required: %.2f%%)",
+                              order.order_id, actual_fill_percent * 100, min_fill_percent * 100)
             return False, []
         
         # Store order for later lookup
@@ -144,136 +132,150 @@ class OrderBook:
         # Try to match the order
         trades = self._match_order(order)
         if trades:
-            self.logger.debug(f"Generated {len(trades)} trades for market order")
+            self.logger.debug("Generated %s trades for market order", len(trades))
         return True, trades
     
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order by ID"""
         if order_id not in self.order_map:
-            self.logger.debug(f"Order {order_id} not found for cancellation")
+            self.logger.debug("Order %s not found for cancellation", order_id)
             return False
         
         order = self.order_map[order_id]
-        self.logger.debug(f"Cancelling order {order_id}: {order.side} {order.quantity} @ {order.price}")
+        self.logger.debug("Cancelling order %s: %s %s @ %s", order_id, order.side, order.quantity, order.price)
         
-        # Remove from price level
+        # Remove from price level; the best price only moves if the best level is removed
         if order.side == "BUY":
             if order.price in self.bids:
                 level = self.bids[order.price]
-                level.orders = [o for o in level.orders if o.order_id != order_id]
+                level.orders.pop(order_id, None)
                 level.quantity -= order.quantity
+                self.total_bid_qty -= order.quantity
                 if level.quantity <= 0:
+                    self.total_bid_qty -= level.quantity
                     del self.bids[order.price]
+                    if order.price == self.best_bid:
+                        self._update_best_bid()
         else:  # SELL
             if order.price in self.asks:
                 level = self.asks[order.price]
-                level.orders = [o for o in level.orders if o.order_id != order_id]
+                level.orders.pop(order_id, None)
                 level.quantity -= order.quantity
+                self.total_ask_qty -= order.quantity
                 if level.quantity <= 0:
+                    self.total_ask_qty -= level.quantity
                     del self.asks[order.price]
+                    if order.price == self.best_ask:
+                        self._update_best_ask()
         
         # Remove from order map
         del self.order_map[order_id]
         
-        # Update best prices
-        self._update_best_prices()
-        
         return True
     
-    def _match_order(self, order: Order) -> List[Tuple[str, float, int, str, str]]:
+    def _match_order(self, order: Order) -> List[Tuple[int, float, int, str, str]]:
         """Match an order against the opposite side of the book"""
         trades = []
         
+        # Walk the opposite side once from its best level; fully consumed levels are
+        # removed afterwards so the iterator is not invalidated mid-walk
+        consumed_prices = []
         if order.side == "BUY":
-            # Match against asks (lowest prices first)
-            # For market orders, match against all available liquidity
-            # For limit orders, match only up to the specified price
-            price_condition = lambda ask_price: True if order.price == float('inf') else ask_price <= order.price
-            while (order.quantity > 0 and self.asks and
-                   price_condition(self.asks.peekitem(0)[0])):
-                ask_price, ask_level = self.asks.peekitem(0)
-                trades.extend(self._execute_match(order, ask_level))
+            # Match against asks (lowest prices first), only up to the order's price;
+            # a market BUY is priced at INF, so it matches all available liquidity
+            asks = self.asks
+            remaining = order.quantity
+            for ask_price, ask_level in asks.items():
+                if order.quantity <= 0 or ask_price > order.price:
+                    break
+                self._execute_match(order, ask_level, trades)
                 if ask_level.quantity <= 0:
-                    del self.asks[ask_price]
+                    consumed_prices.append(ask_price)
+            self.total_ask_qty -= remaining - order.quantity
+            for ask_price in consumed_prices:
+                self.total_ask_qty -= asks.pop(ask_price).quantity
+            # Only the ask side was consumed
+            if trades:
+                self._update_best_ask()
         else:  # SELL
-            # Match against bids (highest prices first)
-            # For market orders, match against all available liquidity
-            # For limit orders, match only up to the specified price
-            price_condition = lambda bid_price: True if order.price == 0.0 else bid_price >= order.price
-            while (order.quantity > 0 and self.bids and
-                   price_condition(self.bids.peekitem(0)[0])):
-                bid_price, bid_level = self.bids.peekitem(0)
-                trades.extend(self._execute_match(order, bid_level))
+            # Match against bids (highest prices first), only down to the order's price;
+            # a market SELL is priced at 0.0, so it matches all available liquidity
+            bids = self.bids
+            remaining = order.quantity
+            for bid_price, bid_level in bids.items():
+                if order.quantity <= 0 or bid_price < order.price:
+                    break
+                self._execute_match(order, bid_level, trades)
                 if bid_level.quantity <= 0:
-                    del self.bids[bid_price]
-        
-        # Update best prices after matching
-        self._update_best_prices()
+                    consumed_prices.append(bid_price)
+            self.total_bid_qty -= remaining - order.quantity
+            for bid_price in consumed_prices:
+                self.total_bid_qty -= bids.pop(bid_price).quantity
+            # Only the bid side was consumed
+            if trades:
+                self._update_best_bid()
         
         return trades
     
-    def _execute_match(self, incoming_order: Order, 
-                      opposite_level: OrderBookLevel) -> List[Tuple[str, float, int, str, str]]:
-        """Execute matches between an incoming order and orders at a level"""
-        trades = []
-        
+    def _execute_match(self, incoming_order: Order, opposite_level: OrderBookLevel,
+                       trades: List[Tuple[int, float, int, str, str]]):
+        """Execute matches between an incoming order and orders at a level, appending to trades"""
         # Process orders at this level in time priority (FIFO)
-        i = 0
-        while i < len(opposite_level.orders) and incoming_order.quantity > 0:
-            existing_order = opposite_level.orders[i]
+        resting_orders = opposite_level.orders
+        incoming_quantity = incoming_order.quantity
+        incoming_agent_id = incoming_order.agent_id
+        traded = 0
+        while resting_orders and incoming_quantity > 0:
+            existing_order = next(iter(resting_orders.values()))
             
             # Determine trade quantity (minimum of both orders)
-            trade_quantity = min(incoming_order.quantity, existing_order.quantity)
+            existing_quantity = existing_order.quantity
+            trade_quantity = incoming_quantity if incoming_quantity < existing_quantity else existing_quantity
             
             # Create trade record
-            trade = (
-                f"TRADE_{incoming_order.order_id}_{existing_order.order_id}",
+            trades.append((
+                next(self._trade_ids),
                 existing_order.price,  # Use existing order price for execution
                 trade_quantity,
-                incoming_order.agent_id,
+                incoming_agent_id,
                 existing_order.agent_id
-            )
-            trades.append(trade)
+            ))
             
             # Update quantities
-            incoming_order.quantity -= trade_quantity
-            existing_order.quantity -= trade_quantity
-            opposite_level.quantity -= trade_quantity
+            incoming_quantity -= trade_quantity
+            traded += trade_quantity
+            existing_order.quantity = existing_quantity - trade_quantity
             
-            # Remove fully executed orders
-            if existing_order.quantity <= 0:
-                del self.order_map[existing_order.order_id]
-                del opposite_level.orders[i]
-            else:
-                i += 1
+            # Remove fully executed orders; a partly filled head means the incoming order is done
+            if existing_order.quantity > 0:
+                break
+            del self.order_map[existing_order.order_id]
+            resting_orders.popitem(last=False)
         
-        return trades
+        incoming_order.quantity = incoming_quantity
+        opposite_level.quantity -= traded
     
     def _update_best_prices(self):
         """Update the best bid and ask prices"""
+        self._update_best_bid()
+        self._update_best_ask()
+    
+    def _update_best_bid(self):
+        """Re-read the best bid from the top of the bid side"""
         self.best_bid = self.bids.peekitem(0)[0] if self.bids else 0.0
-        self.best_ask = self.asks.peekitem(0)[0] if self.asks else float('inf')
+    
+    def _update_best_ask(self):
+        """Re-read the best ask from the top of the ask side"""
+        self.best_ask = self.asks.peekitem(0)[0] if self.asks else INF
     
     def get_order_book_snapshot(self, depth: int = 5) -> Dict[str, List[Tuple[float, int]]]:
         """Get a snapshot of the order book"""
-        bids = []
-        asks = []
-        
-        # Get top bids
-        for i, (price, level) in enumerate(self.bids.items()):
-            if i >= depth:
-                break
-            bids.append((price, level.quantity))
-        
-        # Get top asks
-        for i, (price, level) in enumerate(self.asks.items()):
-            if i >= depth:
-                break
-            asks.append((price, level.quantity))
-        
+        # Slicing the sorted key list is cheaper than walking the items view
+        bids = self.bids
+        asks = self.asks
         return {
-            "bids": bids,
-            "asks": asks,
+            "bids": [(price, bids[price].quantity) for price in bids.keys()[:depth]],
+            "asks": [(price, asks[price].quantity) for price in asks.keys()[:depth]],
             "best_bid": self.best_bid,
             "best_ask": self.best_ask
         }
@@ -283,44 +285,24 @@ class OrderBook:
         Get market depth for a specific side up to a certain depth
         Returns list of (price, quantity) tuples
         """
-        levels = []
-        
-        if side == "BUY":
-            # For buy orders, get asks (what we can buy at)
-            for i, (price, level) in enumerate(self.asks.items()):
-                if i >= depth:
-                    break
-                levels.append((price, level.quantity))
-        else:  # SELL
-            # For sell orders, get bids (what we can sell at)
-            for i, (price, level) in enumerate(self.bids.items()):
-                if i >= depth:
-                    break
-                levels.append((price, level.quantity))
-        
-        return levels
+        # Buy orders look at asks (what we can buy at), sell orders at bids (what we can sell at)
+        book_side = self.asks if side == "BUY" else self.bids
+        return [(price, book_side[price].quantity) for price in book_side.keys()[:depth]]
     
     def get_total_quantity_at_side(self, side: str, depth: int = None) -> int:
         """
         Get total quantity available at a specific side
         If depth is None, checks all levels
         """
+        if depth is None:
+            return self.total_ask_qty if side == "BUY" else self.total_bid_qty
+        
         total_quantity = 0
         
-        if side == "BUY":
-            # For buy orders, sum asks
-            levels = list(self.asks.items())
-            if depth is not None:
-                levels = levels[:depth]
-            for price, level in levels:
-                total_quantity += level.quantity
-        else:  # SELL
-            # For sell orders, sum bids
-            levels = list(self.bids.items())
-            if depth is not None:
-                levels = levels[:depth]
-            for price, level in levels:
-                total_quantity += level.quantity
+        # For buy orders, sum asks; for sell orders, sum bids
+        levels = self.asks.values() if side == "BUY" else self.bids.values()
+        for level in islice(levels, depth):
+            total_quantity += level.quantity
         
         return total_quantity
     
@@ -342,7 +324,8 @@ class OrderBook:
             if filled_quantity >= quantity:
                 break
             
-            quantity_at_level = min(available_quantity, quantity - filled_quantity)
+            still_needed = quantity - filled_quantity
+            quantity_at_level = available_quantity if available_quantity < still_needed else still_needed
             total_cost += price * quantity_at_level
             filled_quantity += quantity_at_level
         
@@ -374,8 +357,8 @@ class OrderBook:
         Calculate a liquidity score based on order book depth
         Returns a score between 0 (no liquidity) and 1 (high liquidity)
         """
-        bid_quantity = self.get_total_quantity_at_side("SELL")
-        ask_quantity = self.get_total_quantity_at_side("BUY")
+        bid_quantity = self.total_bid_qty
+        ask_quantity = self.total_ask_qty
         
         # Normalize by reference quantity
         bid_score = min(bid_quantity / reference_quantity, 1.0)
@@ -386,8 +369,8 @@ class OrderBook:
     
     def get_spread(self) -> float:
         """Get the current bid-ask spread"""
-        if self.best_ask == float('inf') or self.best_bid == 0.0:
-            return float('inf')
+        if self.best_ask == INF or self.best_bid == 0.0:
+            return INF
         return self.best_ask - self.best_bid
     
     def get_imbalance(self) -> float:
@@ -396,8 +379,8 @@ class OrderBook:
         Positive values indicate more buy pressure
         Negative values indicate more sell pressure
         """
-        bid_quantity = self.get_total_quantity_at_side("SELL")
-        ask_quantity = self.get_total_quantity_at_side("BUY")
+        bid_quantity = self.total_bid_qty
+        ask_quantity = self.total_ask_qty
         
         if bid_quantity + ask_quantity == 0:
             return 0.0
@@ -405,10 +388,10 @@ class OrderBook:
         return (bid_quantity - ask_quantity) / (bid_quantity + ask_quantity)
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Represents a trade execution"""
-    trade_id: str
+    trade_id: int
     symbol: str
     price: float
     quantity: int
@@ -417,7 +400,7 @@ class Trade:
     timestamp: int
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     """Represents various market data points"""
     symbol: str
@@ -2,8 +2,9 @@ from typing import Dict, List, Tuple, Optional
 from core.agent import Agent
 from core.message import Message
 from utils.logger import setup_logger
+import itertools
 import logging
-import time
+import sys
 
 
 class OrderBookDepthChecker:
@@ -15,9 +16,21 @@ class OrderBookDepthChecker:
         self.logger = setup_logger(f"OrderBookDepthChecker.{agent.agent_id}")
         self.pending_queries = {}  # query_id -> callback function
         self.query_timeout = 1000  # milliseconds
+        # Topic strings are built once and reused for every query
+        self.depth_topic = sys.intern(f"{symbol}.MARKET_DEPTH")
+        self.depth_response_topic = sys.intern(f"{symbol}.MARKET_DEPTH_RESPONSE")
+        
+        # Query IDs are a cached agent prefix plus a sequence number; the prefix keeps
+        # them distinct from other agents' queries on the shared response topic
+        self._query_prefix = f"{agent.agent_id}_query_"
+        self._query_seq = itertools.count()
         
         # Subscribe to market depth responses
-        agent.subscribe(f"{symbol}.MARKET_DEPTH_RESPONSE")
+        agent.subscribe(self.depth_response_topic)
+    
+    def _next_query_id(self) -> str:
+        """Get a query ID unique to this checker"""
+        return self._query_prefix + str(next(self._query_seq))
     
     def get_market_depth(self, side: str, depth: int = 5, callback=None) -> Optional[List[Tuple[float, int]]]:
         """
@@ -25,10 +38,9 @@ class OrderBookDepthChecker:
         If callback is provided, returns None and calls callback with result
         If callback is None, blocks and returns the result directly
         """
-        query_id = f"{self.agent.agent_id}_depth_{int(time.time() * 1000)}"
-        
         if callback:
             # Asynchronous mode
+            query_id = self._next_query_id()
             self.pending_queries[query_id] = callback
             self._send_query("get_market_depth", {
                 "side": side,
@@ -47,10 +59,9 @@ class OrderBookDepthChecker:
         Get total quantity available at a specific side
         If depth is None, checks all levels
         """
-        query_id = f"{self.agent.agent_id}_quantity_{int(time.time() * 1000)}"
-        
         if callback:
             # Asynchronous mode
+            query_id = self._next_query_id()
             self.pending_queries[query_id] = callback
             self._send_query("get_total_quantity_at_side", {
                 "side": side,
@@ -69,10 +80,9 @@ class OrderBookDepthChecker:
         Calculate the average price, slippage, and fill percentage for a given quantity
         Returns: (average_price, slippage_bps, fill_percentage)
         """
-        query_id = f"{self.agent.agent_id}_price_{int(time.time() * 1000)}"
-        
         if callback:
             # Asynchronous mode
+            query_id = self._next_query_id()
             self.pending_queries[query_id] = callback
             self._send_query("get_average_price_for_quantity", {
                 "side": side,
@@ -91,10 +101,9 @@ class OrderBookDepthChecker:
         Check if an order can be filled with at least min_fill_percent
         Returns: (can_fill, actual_fill_percentage)
         """
-        query_id = f"{self.agent.agent_id}_fill_{int(time.time() * 1000)}"
-        
         if callback:
             # Asynchronous mode
+            query_id = self._next_query_id()
             self.pending_queries[query_id] = callback
             self._send_query("can_fill_order", {
                 "side": side,
@@ -115,10 +124,9 @@ class OrderBookDepthChecker:
         Calculate a liquidity score based on order book depth
         Returns a score between 0 (no liquidity) and 1 (high liquidity)
         """
-        query_id = f"{self.agent.agent_id}_liquidity_{int(time.time() * 1000)}"
-        
         if callback:
             # Asynchronous mode
+            query_id = self._next_query_id()
             self.pending_queries[query_id] = callback
             self._send_query("get_liquidity_score", {
                 "reference_quantity": reference_quantity
@@ -132,10 +140,9 @@ class OrderBookDepthChecker:
     
     def get_spread(self, callback=None) -> Optional[float]:
         """Get the current bid-ask spread"""
-        query_id = f"{self.agent.agent_id}_spread_{int(time.time() * 1000)}"
-        
         if callback:
             # Asynchronous mode
+            query_id = self._next_query_id()
             self.pending_queries[query_id] = callback
             self._send_query("get_spread", {}, query_id)
             return None
@@ -149,10 +156,9 @@ class OrderBookDepthChecker:
         Positive values indicate more buy pressure
         Negative values indicate more sell pressure
         """
-        query_id = f"{self.agent.agent_id}_imbalance_{int(time.time() * 1000)}"
-        
         if callback:
             # Asynchronous mode
+            query_id = self._next_query_id()
             self.pending_queries[query_id] = callback
             self._send_query("get_imbalance", {}, query_id)
             return None
@@ -170,7 +176,7 @@ class OrderBookDepthChecker:
             try:
                 callback(payload)
             except Exception as e:
-                self.logger.error(f"Error in market depth callback: {e}")
+                self.logger.error("Error in market depth callback: %s", e)
     
     def _send_query(self, query_type: str, params: Dict, query_id: str):
         """Send a market depth query to the exchange"""
@@ -180,7 +186,7 @@ class OrderBookDepthChecker:
             "query_id": query_id,
             **params
         }
-        self.agent.send_message(f"{self.symbol}.MARKET_DEPTH", payload)
+        self.agent.send_message(self.depth_topic, payload)
     
     def _send_sync_query(self, query_type: str, params: Dict):
         """Send a synchronous query and wait for response"""
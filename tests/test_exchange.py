@@ -0,0 +1,165 @@
+import unittest
+from unittest.mock import Mock
+from core.exchange import ExchangeAgent
+from core.message import Message, MessageBroker
+
+
+class TestExchangeAgent(unittest.TestCase):
+    """Unit tests for ExchangeAgent message handling"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.broker = MessageBroker()
+        self.exchange = ExchangeAgent("EXCHANGE")
+        self.exchange.set_message_broker(self.broker)
+        self.exchange.kernel = Mock()
+        self.exchange.kernel.get_current_time.return_value = 0
+        self.exchange.initialize_symbol("TEST")
+
+        # Capture everything the exchange publishes
+        self.published = []
+        self.broker.subscribe("OBSERVER", "TEST.*")
+        self.broker.register_agent_handler("OBSERVER", self.published.append)
+
+    def send(self, topic: str, payload: dict, timestamp: int = 10, source_id: str = "AGENT1"):
+        """Deliver a message to the exchange and collect its responses"""
+        self.exchange.receive_message(Message(timestamp=timestamp, topic=topic, payload=payload, source_id=source_id))
+        self.exchange._flush_market_data(timestamp)
+        self.broker.deliver_messages(timestamp)
+
+    def place(self, order_id: str, side: str, price: float, quantity: int = 10):
+        """Submit a limit order for the TEST symbol"""
+        self.send("TEST.ORDER", {
+            "order_id": order_id,
+            "symbol": "TEST",
+            "side": side,
+            "price": price,
+            "quantity": quantity
+        })
+
+    def published_on(self, topic: str):
+        """Get the payloads published on a topic"""
+        return [message.payload for message in self.published if message.topic == topic]
+
+    def test_limit_orders_cross_and_trade(self):
+        """Test that crossing limit orders produce a trade message"""
+        self.place("ASK1", "SELL", 100.0)
+        self.place("BID1", "BUY", 100.0)
+
+        trades = self.published_on("TEST.TRADE")
+        self.assertEqual(len(trades), 1)
+        self.assertEqual(trades[0]["price"], 100.0)
+        self.assertEqual(trades[0]["quantity"], 10)
+        self.assertEqual(len(self.exchange.trade_history), 1)
+
+    def test_trade_history_bounded_with_sink(self):
+        """Test that trade history keeps only the newest trades and hands older ones to the sink"""
+        self.exchange = ExchangeAgent("EXCHANGE", max_trade_history=2)
+        self.exchange.set_message_broker(self.broker)
+        self.exchange.kernel = Mock()
+        self.exchange.kernel.get_current_time.return_value = 0
+        self.exchange.initialize_symbol("TEST")
+        evicted = []
+        self.exchange.trade_sink = evicted.append
+
+        for i in range(3):
+            self.place(f"ASK{i}", "SELL", 100.0 + i)
+            self.place(f"BID{i}", "BUY", 100.0 + i)
+
+        self.assertEqual([trade.price for trade in evicted], [100.0])
+        self.assertEqual([trade.price for trade in self.exchange.trade_history], [101.0, 102.0])
+
+    def test_market_buy_order_fills_against_asks(self):
+        """Test that a BUY at the infinite sentinel price executes as a market order"""
+        self.place("ASK1", "SELL", 101.0)
+        self.place("MKT1", "BUY", float('inf'))
+
+        trades = self.published_on("TEST.TRADE")
+        self.assertEqual(len(trades), 1)
+        self.assertEqual(trades[0]["price"], 101.0)
+        self.assertNotIn("ASK1", self.exchange.order_books["TEST"].order_map)
+
+    def test_limit_prices_snapped_to_tick_grid(self):
+        """Test that limit prices differing only by float error rest on one level"""
+        self.place("BID1", "BUY", 0.1 + 0.2)
+        self.place("BID2", "BUY", 0.3)
+
+        bids = self.exchange.order_books["TEST"].bids
+        self.assertEqual(list(bids.keys()), [0.3])
+        self.assertEqual(bids[0.3].quantity, 20)
+
+    def test_order_updates_published_in_order(self):
+        """Test that an order's trade, price and order book updates go out in that order"""
+        self.place("ASK1", "SELL", 100.0)
+        self.published.clear()
+        self.place("BID1", "BUY", 100.0)
+
+        self.assertEqual([message.topic for message in self.published], ["TEST.TRADE", "TEST.PRICE", "TEST.ORDERBOOK"])
+
+    def test_price_published_only_when_top_of_book_moves(self):
+        """Test that PRICE is skipped for orders that leave the best bid and ask unchanged"""
+        self.place("BID1", "BUY", 99.0)
+        self.place("BID2", "BUY", 98.0)
+        self.place("BID3", "BUY", 99.5)
+
+        self.assertEqual([p["best_bid"] for p in self.published_on("TEST.PRICE")], [99.0, 99.5])
+
+    def test_orderbook_skipped_when_visible_depth_unchanged(self):
+        """Test that ORDERBOOK is skipped for orders below the published depth"""
+        for i in range(6):
+            self.place(f"BID{i}", "BUY", 99.0 - i)
+
+        self.assertEqual(len(self.published_on("TEST.ORDERBOOK")), 5)
+
+    def test_market_data_coalesced_per_timestamp(self):
+        """Test that several orders at one timestamp produce a single PRICE and ORDERBOOK update"""
+        for order_id, price in (("BID1", 99.0), ("BID2", 99.5), ("ASK1", 101.0)):
+            self.exchange.receive_message(Message(timestamp=10, topic="TEST.ORDER", source_id="AGENT1", payload={
+                "order_id": order_id, "symbol": "TEST", "side": "SELL" if order_id == "ASK1" else "BUY",
+                "price": price, "quantity": 10
+            }))
+        self.exchange._flush_market_data(10)
+        self.broker.deliver_messages(10)
+
+        prices = self.published_on("TEST.PRICE")
+        self.assertEqual(len(prices), 1)
+        self.assertEqual((prices[0]["best_bid"], prices[0]["best_ask"]), (99.5, 101.0))
+        self.assertEqual(len(self.published_on("TEST.ORDERBOOK")), 1)
+
+    def test_cancel_batch(self):
+        """Test that a batched cancel removes every listed order and confirms once"""
+        self.place("BID1", "BUY", 99.0)
+        self.place("BID2", "BUY", 98.0)
+        self.place("ASK1", "SELL", 101.0)
+        self.published.clear()
+
+        self.send("TEST.CANCEL_BATCH", {"symbol": "TEST", "order_ids": ["BID1", "BID2", "MISSING"]})
+
+        order_book = self.exchange.order_books["TEST"]
+        self.assertNotIn("BID1", order_book.order_map)
+        self.assertNotIn("BID2", order_book.order_map)
+        self.assertIn("ASK1", order_book.order_map)
+        self.assertEqual(self.published_on("TEST.CANCEL_BATCH_CONFIRM"), [{"order_ids": ["BID1", "BID2"], "cancelled": True}])
+        self.assertEqual(len(self.published_on("TEST.PRICE")), 1)
+
+    def test_stats_vwap_covers_recent_trades_only(self):
+        """Test that STATS reports volume and VWAP for trades inside the update interval"""
+        self.place("ASK1", "SELL", 100.0)
+        self.place("BID1", "BUY", 100.0)
+        self.place("ASK2", "SELL", 103.0, quantity=30)
+        self.place("BID2", "BUY", 103.0, quantity=30)
+
+        self.exchange._publish_market_statistics(100)
+        self.broker.deliver_messages(100)
+        self.exchange._publish_market_statistics(200)
+        self.broker.deliver_messages(200)
+
+        stats = self.published_on("TEST.STATS")
+        self.assertEqual(stats[0]["volume"], 40)
+        self.assertAlmostEqual(stats[0]["vwap"], 102.25)
+        self.assertEqual(stats[1]["volume"], 0)
+        self.assertEqual(stats[1]["vwap"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from core.kernel import Kernel
+from core.agent import ActiveAgent, PassiveAgent
+
+
+class RecordingAgent(ActiveAgent):
+    """Active agent that records its wakeups and optionally reschedules itself"""
+
+    def __init__(self, agent_id: str, interval: int = 0):
+        super().__init__(agent_id)
+        self.interval = interval
+        self.wakeups = []
+
+    def wakeup(self, current_time: int):
+        super().wakeup(current_time)
+        self.wakeups.append(current_time)
+        if self.interval:
+            self.schedule_wakeup(current_time + self.interval)
+
+
+class TestKernel(unittest.TestCase):
+    """Unit tests for Kernel wakeup scheduling"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.kernel = Kernel()
+
+    def test_agent_rescheduled_wakeups_reach_kernel(self):
+        """Test that wakeups an agent schedules for itself are run by the kernel"""
+        agent = RecordingAgent("A", interval=100)
+        self.kernel.register_agent(agent)
+        agent.schedule_wakeup(100)
+
+        self.kernel.run(450)
+
+        self.assertEqual(agent.wakeups, [100, 200, 300, 400])
+
+    def test_wakeups_requested_before_registration(self):
+        """Test that wakeups requested before the kernel is set are not lost"""
+        agent = RecordingAgent("A")
+        agent.schedule_wakeup(50)
+        self.kernel.register_agent(agent)
+
+        self.kernel.run(100)
+
+        self.assertEqual(agent.wakeups, [50])
+
+    def test_duplicate_wakeups_run_once(self):
+        """Test that an agent scheduled twice for the same time wakes up once"""
+        agent = RecordingAgent("A")
+        self.kernel.register_agent(agent)
+        agent.schedule_wakeup(100)
+        self.kernel.schedule_agent_wakeup("A", 100)
+
+        self.kernel.run(200)
+
+        self.assertEqual(agent.wakeups, [100])
+
+    def test_agents_woken_in_schedule_order(self):
+        """Test that agents sharing a timestamp wake in the order they were scheduled"""
+        order = []
+        agents = [RecordingAgent(agent_id) for agent_id in ("C", "A", "B")]
+        for agent in agents:
+            agent.wakeup = lambda t, agent_id=agent.agent_id: order.append(agent_id)
+            self.kernel.register_agent(agent)
+            self.kernel.schedule_agent_wakeup(agent.agent_id, 100)
+
+        self.kernel.run(200)
+
+        self.assertEqual(order, ["C", "A", "B"])
+
+    def test_delivery_hooks_run_before_wakeups(self):
+        """Test that delivery hooks run at each processed timestamp ahead of agent wakeups"""
+        calls = []
+        agent = RecordingAgent("A")
+        agent.wakeup = lambda current_time: calls.append(("wakeup", current_time))
+        self.kernel.register_agent(agent)
+        self.kernel.add_delivery_hook(lambda timestamp: calls.append(("hook", timestamp)))
+        agent.schedule_wakeup(100)
+
+        self.kernel.run(200)
+
+        self.assertEqual(calls, [("hook", 100), ("wakeup", 100), ("hook", 200)])
+
+    def test_passive_agents_are_not_woken(self):
+        """Test that wakeup events for passive agents are skipped"""
+        passive = PassiveAgent("P")
+        active = RecordingAgent("A")
+        self.kernel.register_agent(passive)
+        self.kernel.register_agent(active)
+        self.kernel.schedule_agent_wakeup("P", 100)
+        self.kernel.schedule_agent_wakeup("A", 100)
+
+        self.kernel.run(200)
+
+        self.assertEqual(active.wakeups, [100])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -51,26 +51,67 @@ class TestLiquidityProviderAgent(unittest.TestCase):
     
     def test_cancel_existing_limit_orders(self):
         """Test that existing limit orders are cancelled correctly"""
-        # Add some orders to the active orders dict
-        self.agent.active_limit_orders = {
-            "ORDER1": "BUY",
-            "ORDER2": "SELL"
-        }
+        # Add some orders to the active orders list
+        self.agent.active_limit_orders = ["ORDER1", "ORDER2"]
         
         # Call the cancel method
         self.agent._cancel_existing_limit_orders()
         
-        # Verify that send_message was called for each order
-        self.assertEqual(self.agent.message_broker.publish.call_count, 2)
+        # Verify that a single batched cancel was sent for all orders
+        self.agent.message_broker.publish.assert_called_once()
+        message = self.agent.message_broker.publish.call_args[0][0]
+        self.assertEqual(message.topic, "TEST.CANCEL_BATCH")
+        self.assertEqual(message.payload, {"symbol": "TEST", "order_ids": ["ORDER1", "ORDER2"]})
         
-        # Verify that the active orders dict is now empty
+        # Verify that the active orders list is now empty
         self.assertEqual(len(self.agent.active_limit_orders), 0)
     
-    @patch('random.choice')
-    def test_make_random_market_trade(self, mock_random_choice):
+    def test_limit_order_ids_are_unique(self):
+        """Test that repeated liquidity provision never reuses an order ID"""
+        self.agent._place_limit_orders(1000)
+        self.agent._place_limit_orders(1000)
+        
+        order_ids = [
+            message.payload["order_id"]
+            for call in self.agent.message_broker.publish_batch.call_args_list
+            for message in call[0][0]
+            if message.topic == "TEST.ORDER"
+        ]
+        self.assertEqual(len(order_ids), 4 * self.agent.max_orders_per_side)
+        self.assertEqual(len(set(order_ids)), len(order_ids))
+        self.assertTrue(all(order_id.startswith("LP_TEST_") for order_id in order_ids))
+    
+    def test_limit_order_ladder_prices(self):
+        """Test that ladder levels step away from fair value and follow spread changes"""
+        self.agent._place_limit_orders(1000)
+        orders = self.agent.message_broker.publish_batch.call_args[0][0]
+        self.assertEqual([m.payload["price"] for m in orders[:4]], [99.0, 101.0, 98.5, 101.5])
+        
+        self.agent.spread = 0.04
+        self.agent._place_limit_orders(2000)
+        orders = self.agent.message_broker.publish_batch.call_args[0][0]
+        self.assertEqual([m.payload["price"] for m in orders[:2]], [98.0, 102.0])
+    
+    def test_limit_order_payloads_reused_after_delivery(self):
+        """Test that ladder payloads are only reused for a later timestamp"""
+        self.agent._place_limit_orders(1000)
+        first_payloads = list(self.agent._ladder_payloads)
+        
+        # Same timestamp: earlier payloads may still be queued, so fresh dicts are used
+        self.agent._place_limit_orders(1000)
+        self.assertTrue(all(a is not b for a, b in zip(first_payloads, self.agent._ladder_payloads)))
+        
+        # Later timestamp: the previous ladder has been delivered and is refilled in place
+        second_payloads = list(self.agent._ladder_payloads)
+        self.agent._place_limit_orders(2000)
+        self.assertTrue(all(a is b for a, b in zip(second_payloads, self.agent._ladder_payloads)))
+        self.assertEqual([p["side"] for p in self.agent._ladder_payloads[:2]], ["BUY", "SELL"])
+    
+    @patch.object(LiquidityProviderAgent, '_draw_side')
+    def test_make_random_market_trade(self, mock_draw_side):
         """Test that random market trades are placed correctly"""
-        # Mock random choice to return "BUY"
-        mock_random_choice.return_value = "BUY"
+        # Mock the side draw to return "BUY"
+        mock_draw_side.return_value = "BUY"
         
         # Set up order book state
         self.agent.last_order_book_state = {
@@ -95,6 +136,30 @@ class TestLiquidityProviderAgent(unittest.TestCase):
         self.assertEqual(message.payload["quantity"], 10)  # Default market order size
         self.assertEqual(message.payload["symbol"], "TEST")
     
+    def test_draw_side_refills_in_batches(self):
+        """Test that sides are drawn from a prefilled batch and refilled when exhausted"""
+        self.agent.side_draw_batch_size = 4
+        with patch.object(self.agent.rng, 'choices', return_value=["SELL", "BUY", "BUY", "SELL"]) as mock_choices:
+            sides = [self.agent._draw_side() for _ in range(8)]
+        
+        self.assertEqual(mock_choices.call_count, 2)
+        self.assertEqual(sides, ["SELL", "BUY", "BUY", "SELL"] * 2)
+    
+    def test_side_draws_are_reproducible(self):
+        """Test that agents with the same ID or seed draw the same sides"""
+        other = LiquidityProviderAgent("LP_TEST", "TEST")
+        self.assertEqual(
+            [self.agent._draw_side() for _ in range(20)],
+            [other._draw_side() for _ in range(20)]
+        )
+        
+        seeded = LiquidityProviderAgent("LP_OTHER", "TEST", seed=7)
+        same_seed = LiquidityProviderAgent("LP_ANOTHER", "TEST", seed=7)
+        self.assertEqual(
+            [seeded._draw_side() for _ in range(20)],
+            [same_seed._draw_side() for _ in range(20)]
+        )
+    
     def test_receive_message_orderbook(self):
         """Test that order book messages are processed correctly"""
         # Create a message with order book data
@@ -134,19 +199,17 @@ class TestLiquidityProviderAgent(unittest.TestCase):
         # Process the message (should not raise an exception)
         self.agent.receive_message(message)
     
-    def test_wakeup_scheduling(self):
+    @patch.object(LiquidityProviderAgent, 'schedule_wakeup')
+    def test_wakeup_scheduling(self, mock_schedule_wakeup):
         """Test that wakeup schedules the next wakeup correctly"""
-        # Mock schedule_wakeup
-        self.agent.schedule_wakeup = Mock()
-        
         # Call wakeup
         self.agent.wakeup(1000)
         
         # Verify that schedule_wakeup was called
-        self.agent.schedule_wakeup.assert_called_once()
+        mock_schedule_wakeup.assert_called_once()
         
         # Get the scheduled time
-        scheduled_time = self.agent.schedule_wakeup.call_args[0][0]
+        scheduled_time = mock_schedule_wakeup.call_args[0][0]
         
         # Verify that the scheduled time is reasonable (should be at least 500ms in the future)
         self.assertGreaterEqual(scheduled_time, 1000)
@@ -0,0 +1,100 @@
+import unittest
+from core.message import Message, MessageBroker, get_topic_id
+
+
+class TestMessageBroker(unittest.TestCase):
+    """Unit tests for MessageBroker queueing and delivery"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.broker = MessageBroker()
+        self.received = []
+        self.broker.register_agent_handler("AGENT1", self.received.append)
+
+    def test_same_timestamp_messages_delivered_in_publish_order(self):
+        """Test that messages sharing a timestamp are delivered in the order they were published"""
+        self.broker.subscribe("AGENT1", "TEST.PRICE")
+        for i in range(5):
+            self.broker.publish(Message(timestamp=100, topic="TEST.PRICE", payload={"i": i}, source_id="EXCHANGE"))
+
+        self.broker.deliver_messages(100)
+
+        self.assertEqual([message.payload["i"] for message in self.received], [0, 1, 2, 3, 4])
+
+    def test_publish_batch_keeps_order(self):
+        """Test that a published batch is delivered in list order"""
+        self.broker.subscribe("AGENT1", "TEST.ORDER")
+        messages = [
+            Message(timestamp=100, topic="TEST.ORDER", payload={"i": i}, source_id="LP")
+            for i in range(3)
+        ]
+        self.broker.publish_batch(messages)
+
+        self.broker.deliver_messages(100)
+
+        self.assertEqual(self.received, messages)
+
+    def test_future_messages_are_not_delivered(self):
+        """Test that only messages up to the current timestamp are delivered"""
+        self.broker.subscribe("AGENT1", "TEST.PRICE")
+        self.broker.publish(Message(timestamp=200, topic="TEST.PRICE", payload={}, source_id="EXCHANGE"))
+
+        self.broker.deliver_messages(100)
+        self.assertEqual(len(self.received), 0)
+
+        self.broker.deliver_messages(200)
+        self.assertEqual(len(self.received), 1)
+
+    def test_wildcard_subscription_delivers(self):
+        """Test that prefix and suffix wildcard patterns receive matching messages"""
+        self.broker.subscribe("AGENT1", "TEST.*")
+        self.broker.subscribe("AGENT1", "*.TRADE")
+        self.broker.publish(Message(timestamp=100, topic="TEST.PRICE", payload={}, source_id="EXCHANGE"))
+        self.broker.publish(Message(timestamp=100, topic="OTHER.TRADE", payload={}, source_id="EXCHANGE"))
+        self.broker.publish(Message(timestamp=100, topic="OTHER.PRICE", payload={}, source_id="EXCHANGE"))
+
+        self.broker.deliver_messages(100)
+
+        self.assertEqual([message.topic for message in self.received], ["TEST.PRICE", "OTHER.TRADE"])
+
+    def test_subscription_change_refreshes_recipients(self):
+        """Test that cached recipients are refreshed after subscribe and unsubscribe"""
+        self.broker.subscribe("AGENT1", "TEST.PRICE")
+        self.broker.publish(Message(timestamp=100, topic="TEST.PRICE", payload={}, source_id="EXCHANGE"))
+        self.broker.deliver_messages(100)
+
+        other = []
+        self.broker.register_agent_handler("AGENT2", other.append)
+        self.broker.subscribe("AGENT2", "TEST.*")
+        self.broker.unsubscribe("AGENT1", "TEST.PRICE")
+        self.broker.publish(Message(timestamp=200, topic="TEST.PRICE", payload={}, source_id="EXCHANGE"))
+        self.broker.deliver_messages(200)
+
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(len(other), 1)
+
+
+class TestTopicIds(unittest.TestCase):
+    """Unit tests for integer topic IDs"""
+
+    def test_topic_id_is_stable(self):
+        """Test that a topic always maps to the same ID and distinct topics get distinct IDs"""
+        self.assertEqual(get_topic_id("TEST.PRICE"), get_topic_id("TEST.PRICE"))
+        self.assertNotEqual(get_topic_id("TEST.PRICE"), get_topic_id("TEST.TRADE"))
+
+    def test_message_carries_topic_id(self):
+        """Test that messages are stamped with their topic's ID"""
+        message = Message(timestamp=0, topic="TEST.ORDERBOOK", payload={}, source_id="EXCHANGE")
+        self.assertEqual(message.topic_id, get_topic_id("TEST.ORDERBOOK"))
+
+    def test_message_ids_follow_creation_order(self):
+        """Test that message IDs are increasing integers, so equal timestamps order by creation"""
+        first = Message(timestamp=0, topic="TEST.ORDER", payload={}, source_id="A")
+        second = Message(timestamp=0, topic="TEST.ORDER", payload={}, source_id="A")
+        self.assertIsInstance(first.message_id, int)
+        self.assertLess(first.message_id, second.message_id)
+        self.assertLess(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
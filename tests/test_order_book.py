@@ -24,6 +24,7 @@ class TestOrderBook(unittest.TestCase):
         # Verify the order was accepted
         self.assertTrue(can_fill)
         self.assertEqual(len(trades), 2)  # Should generate 2 trades
+        self.assertEqual([trade[0] for trade in trades], [1, 2])  # Trade IDs count up per book
     
     def test_market_order_with_insufficient_liquidity(self):
         """Test placing market order when orderbook has insufficient liquidity"""
@@ -86,6 +87,76 @@ class TestOrderBook(unittest.TestCase):
         self.assertIn("LIMIT1", self.order_book.order_map)
         self.assertEqual(self.order_book.order_map["LIMIT1"].quantity, 100)
 
+    def test_fully_filled_limit_order_does_not_rest(self):
+        """Test that a limit order filled on arrival leaves no level or order behind on its own side"""
+        self.order_book.add_limit_order(Order("ASK1", "AGENT1", "TEST", "SELL", 100.0, 50, 1000))
+        
+        trades = self.order_book.add_limit_order(Order("BID1", "AGENT2", "TEST", "BUY", 100.0, 30, 1001))
+        
+        self.assertEqual(sum(trade[2] for trade in trades), 30)
+        self.assertNotIn("BID1", self.order_book.order_map)
+        self.assertEqual(len(self.order_book.bids), 0)
+        self.assertEqual(self.order_book.best_bid, 0.0)
+        self.assertEqual(self.order_book.total_bid_qty, 0)
+        self.assertEqual(self.order_book.total_ask_qty, 20)
+
+
+    def test_bid_levels_sorted_best_first(self):
+        """Test that bid levels iterate from the highest price and depth totals stop at the requested depth"""
+        for i, price in enumerate((99.0, 100.0, 98.0)):
+            self.order_book.add_limit_order(Order(f"BID{i}", "AGENT1", "TEST", "BUY", price, 10 * (i + 1), 1000 + i))
+        
+        self.assertEqual(list(self.order_book.bids.keys()), [100.0, 99.0, 98.0])
+        self.assertEqual(self.order_book.best_bid, 100.0)
+        self.assertEqual(self.order_book.get_total_quantity_at_side("SELL", depth=2), 30)
+        self.assertEqual(self.order_book.get_total_quantity_at_side("SELL"), 60)
+        self.assertEqual(self.order_book.get_total_quantity_at_side("BUY"), 0)
+
+
+    def test_cancel_keeps_time_priority_of_remaining_orders(self):
+        """Test that cancelling a resting order leaves the others matched in arrival order"""
+        for i in range(3):
+            self.order_book.add_limit_order(Order(f"ASK{i}", f"AGENT{i}", "TEST", "SELL", 100.0, 10, 1000 + i))
+        self.assertTrue(self.order_book.cancel_order("ASK1"))
+        
+        trades = self.order_book.add_limit_order(Order("BID1", "AGENT9", "TEST", "BUY", 100.0, 15, 1003))
+        
+        self.assertEqual([(trade[2], trade[4]) for trade in trades], [(10, "AGENT0"), (5, "AGENT2")])
+        self.assertEqual(list(self.order_book.asks[100.0].orders), ["ASK2"])
+        self.assertEqual(self.order_book.asks[100.0].quantity, 5)
+
+    def test_best_prices_follow_adds_cancels_and_fills(self):
+        """Test that best bid and ask track the top of book as orders are added, cancelled and filled"""
+        self.order_book.add_limit_order(Order("BID1", "AGENT1", "TEST", "BUY", 99.0, 10, 1000))
+        self.order_book.add_limit_order(Order("BID2", "AGENT1", "TEST", "BUY", 98.0, 10, 1001))
+        self.order_book.add_limit_order(Order("ASK1", "AGENT2", "TEST", "SELL", 101.0, 10, 1002))
+        self.order_book.add_limit_order(Order("ASK2", "AGENT2", "TEST", "SELL", 102.0, 10, 1003))
+        self.assertEqual((self.order_book.best_bid, self.order_book.best_ask), (99.0, 101.0))
+        
+        self.order_book.cancel_order("BID2")
+        self.assertEqual(self.order_book.best_bid, 99.0)
+        self.order_book.cancel_order("BID1")
+        self.assertEqual(self.order_book.best_bid, 0.0)
+        
+        self.order_book.add_market_order(Order("MKT1", "AGENT3", "TEST", "BUY", float('inf'), 10, 1004))
+        self.assertEqual(self.order_book.best_ask, 102.0)
+
+    def test_side_totals_track_adds_cancels_and_fills(self):
+        """Test that the running side totals match the resting quantity after each change"""
+        self.order_book.add_limit_order(Order("ASK1", "AGENT1", "TEST", "SELL", 101.0, 30, 1000))
+        self.order_book.add_limit_order(Order("ASK2", "AGENT1", "TEST", "SELL", 102.0, 20, 1001))
+        self.order_book.add_limit_order(Order("BID1", "AGENT2", "TEST", "BUY", 99.0, 15, 1002))
+        self.assertEqual(self.order_book.get_total_quantity_at_side("BUY"), 50)
+        self.assertEqual(self.order_book.get_total_quantity_at_side("SELL"), 15)
+        
+        self.order_book.add_market_order(Order("MKT1", "AGENT3", "TEST", "BUY", float('inf'), 40, 1003))
+        self.assertEqual(self.order_book.get_total_quantity_at_side("BUY"), 10)
+        
+        self.order_book.cancel_order("ASK2")
+        self.order_book.cancel_order("BID1")
+        self.assertEqual(self.order_book.get_total_quantity_at_side("BUY"), 0)
+        self.assertEqual(self.order_book.get_total_quantity_at_side("SELL"), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import unittest
+from utils.ring_buffer import RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Unit tests for RingBuffer"""
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.buffer = RingBuffer(3)
+    
+    def test_append_until_full(self):
+        """Test that values are kept in insertion order until capacity is reached"""
+        for value in (1.0, 2.0, 3.0):
+            self.assertIsNone(self.buffer.append(value))
+        
+        self.assertTrue(self.buffer.is_full())
+        self.assertEqual(list(self.buffer), [1.0, 2.0, 3.0])
+    
+    def test_append_evicts_oldest(self):
+        """Test that appending to a full buffer evicts and returns the oldest value"""
+        for value in (1.0, 2.0, 3.0):
+            self.buffer.append(value)
+        
+        self.assertEqual(self.buffer.append(4.0), 1.0)
+        self.assertEqual(list(self.buffer), [2.0, 3.0, 4.0])
+        self.assertEqual(len(self.buffer), 3)
+    
+    def test_indexing(self):
+        """Test positive and negative indexing relative to the oldest value"""
+        for value in (1.0, 2.0, 3.0, 4.0):
+            self.buffer.append(value)
+        
+        self.assertEqual(self.buffer[0], 2.0)
+        self.assertEqual(self.buffer[-1], 4.0)
+        self.assertEqual(self.buffer[-3], 2.0)
+        with self.assertRaises(IndexError):
+            self.buffer[3]
+        with self.assertRaises(IndexError):
+            self.buffer[-4]
+    
+    def test_rolling_mean_and_variance(self):
+        """Test that mean and variance track only the buffered values"""
+        for value in (1.0, 2.0, 3.0, 10.0, 20.0):
+            self.buffer.append(value)
+        
+        self.assertAlmostEqual(self.buffer.mean(), 11.0)
+        self.assertAlmostEqual(self.buffer.variance(), ((3 - 11) ** 2 + (10 - 11) ** 2 + (20 - 11) ** 2) / 3)
+    
+    def test_stats_of_empty_buffer(self):
+        """Test that an empty buffer reports zero mean and variance"""
+        self.assertEqual(self.buffer.mean(), 0.0)
+        self.assertEqual(self.buffer.variance(), 0.0)
+    
+    def test_clear(self):
+        """Test that clear empties the buffer"""
+        self.buffer.append(1.0)
+        self.buffer.clear()
+        
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(list(self.buffer), [])
+        self.assertEqual(self.buffer.mean(), 0.0)
+    
+    def test_invalid_capacity(self):
+        """Test that a non-positive capacity is rejected"""
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
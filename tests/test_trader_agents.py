@@ -0,0 +1,150 @@
+import unittest
+from unittest.mock import Mock
+from agents import MarketMakerAgent, MomentumTraderAgent, MeanReversionTraderAgent
+from core.message import Message
+
+
+def price_message(best_bid: float, best_ask: float, timestamp: int = 1000) -> Message:
+    """Build a PRICE message for the TEST symbol"""
+    return Message(
+        timestamp=timestamp,
+        topic="TEST.PRICE",
+        payload={"best_bid": best_bid, "best_ask": best_ask},
+        source_id="EXCHANGE"
+    )
+
+
+class TestMarketMakerAgent(unittest.TestCase):
+    """Unit tests for MarketMakerAgent"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.agent = MarketMakerAgent("MM_TEST", "TEST", 100.0, 0.02)
+        self.agent.kernel = Mock()
+        self.agent.kernel.get_current_time.return_value = 1000
+        self.agent.message_broker = Mock()
+
+    def quoted_prices(self):
+        """Get the (side, price) pairs of the orders published so far"""
+        return [
+            (message.payload["side"], message.payload["price"])
+            for call in self.agent.message_broker.publish_batch.call_args_list
+            for message in call[0][0]
+            if message.topic == "TEST.ORDER"
+        ]
+
+    def test_place_quotes_around_fair_value(self):
+        """Test that quotes are placed half a spread either side of fair value"""
+        self.agent._place_quotes()
+        self.assertEqual(self.quoted_prices(), [("BUY", 99.0), ("SELL", 101.0)])
+
+    def test_spread_change_updates_quotes(self):
+        """Test that changing the spread is reflected in the next quotes"""
+        self.agent.spread = 0.04
+        self.agent._place_quotes()
+        self.assertEqual(self.quoted_prices(), [("BUY", 98.0), ("SELL", 102.0)])
+
+    def test_quotes_on_cent_grid(self):
+        """Test that quotes for a fractional fair value land exactly on whole cents"""
+        self.agent.fair_value = 100.37
+        self.agent._place_quotes()
+        self.assertEqual(self.quoted_prices(), [("BUY", 99.37), ("SELL", 101.37)])
+
+    def test_quote_payloads_reused_after_delivery(self):
+        """Test that quote payloads are only reused for a later timestamp"""
+        self.agent._place_quotes()
+        first_payloads = self.agent._quote_payloads
+
+        # Same timestamp: earlier payloads may still be queued, so fresh dicts are used
+        self.agent._place_quotes()
+        self.assertIsNot(self.agent._quote_payloads, first_payloads)
+
+        # Later timestamp: the previous quotes have been delivered and are refilled in place
+        second_payloads = self.agent._quote_payloads
+        self.agent.kernel.get_current_time.return_value = 1500
+        self.agent._place_quotes()
+        self.assertIs(self.agent._quote_payloads, second_payloads)
+        self.assertEqual([p["side"] for p in second_payloads], ["BUY", "SELL"])
+
+
+class TestMomentumTraderAgent(unittest.TestCase):
+    """Unit tests for MomentumTraderAgent"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.agent = MomentumTraderAgent("MOM_TEST", "TEST")
+        self.agent.kernel = Mock()
+        self.agent.kernel.get_current_time.return_value = 1000
+        self.agent.message_broker = Mock()
+
+    def test_price_history_is_bounded(self):
+        """Test that price history keeps only the most recent max_history prices"""
+        for i in range(self.agent.max_history + 5):
+            self.agent.receive_message(price_message(99.0 + i, 101.0 + i, timestamp=i))
+
+        self.assertEqual(len(self.agent.price_history), self.agent.max_history)
+        self.assertEqual(self.agent.price_history[0], 105.0)
+        self.assertEqual(self.agent.price_history[-1], 114.0)
+
+    def test_upward_momentum_places_buy_order(self):
+        """Test that a rising mid price triggers a buy order"""
+        for i in range(5):
+            self.agent.receive_message(price_message(99.0 + i * 0.1, 101.0 + i * 0.1, timestamp=i))
+
+        message = self.agent.message_broker.publish.call_args[0][0]
+        self.assertEqual(message.topic, "TEST.ORDER")
+        self.assertEqual(message.payload["side"], "BUY")
+
+    def test_flat_prices_place_no_order(self):
+        """Test that unchanged prices do not trigger any order"""
+        for i in range(10):
+            self.agent.receive_message(price_message(99.0, 101.0, timestamp=i))
+
+        self.agent.message_broker.publish.assert_not_called()
+
+    def test_order_ids_unique_at_same_price(self):
+        """Test that repeated orders at the same price get distinct IDs"""
+        self.agent.price_history.append(100.0)
+        self.agent._place_order("BUY")
+        self.agent._place_order("BUY")
+
+        order_ids = [call[0][0].payload["order_id"] for call in self.agent.message_broker.publish.call_args_list]
+        self.assertEqual(len(set(order_ids)), 2)
+        self.assertTrue(all(order_id.startswith("MOM_TEST_BUY_") for order_id in order_ids))
+
+
+class TestMeanReversionTraderAgent(unittest.TestCase):
+    """Unit tests for MeanReversionTraderAgent"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.agent = MeanReversionTraderAgent("MR_TEST", "TEST")
+        self.agent.kernel = Mock()
+        self.agent.kernel.get_current_time.return_value = 1000
+        self.agent.message_broker = Mock()
+
+    def test_no_order_before_enough_history(self):
+        """Test that no order is placed until enough prices have been observed"""
+        for i in range(9):
+            self.agent.receive_message(price_message(89.0, 91.0, timestamp=i))
+
+        self.agent.message_broker.publish.assert_not_called()
+
+    def test_price_below_fair_value_places_buy_order(self):
+        """Test that a price well below fair value triggers a buy order"""
+        for i in range(10):
+            self.agent.receive_message(price_message(89.0, 91.0, timestamp=i))
+
+        message = self.agent.message_broker.publish.call_args[0][0]
+        self.assertEqual(message.payload["side"], "BUY")
+        self.assertEqual(message.payload["price"], 95.0)
+
+    def test_stats_update_fair_value(self):
+        """Test that STATS messages update the fair value from VWAP"""
+        message = Message(timestamp=1000, topic="TEST.STATS", payload={"vwap": 105.0}, source_id="EXCHANGE")
+        self.agent.receive_message(message)
+        self.assertEqual(self.agent.fair_value, 105.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,33 +21,46 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'      # Reset
     }
     
+    # Project root, for showing source paths relative to it
+    PROJECT_ROOT = pathlib.Path(__file__).parent.parent
+    
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, use_color: bool = True):
+        super().__init__(fmt, datefmt)
+        # One formatter per level with the color codes baked into the format string,
+        # so records are formatted without rebuilding strings around them
+        self._level_formatters = {}
+        if use_color and fmt is not None:
+            reset = self.COLORS['RESET']
+            for levelname, color in self.COLORS.items():
+                if levelname == 'RESET':
+                    continue
+                level_fmt = fmt.replace('%(levelname)s', f"{color}%(levelname)s{reset}")
+                self._level_formatters[levelname] = logging.Formatter(f"{color}{level_fmt}{reset}", datefmt)
+        # Relative source paths, computed once per file
+        self._relative_paths = {}
+    
     def format(self, record):
         # Make path relative to project root
-        if hasattr(record, 'pathname') and record.pathname:
-            try:
-                # Get the project root directory
-                project_root = pathlib.Path(__file__).parent.parent
-                # Make the path relative
-                relative_path = pathlib.Path(record.pathname).relative_to(project_root)
-                record.pathname = str(relative_path)
-            except ValueError:
-                # If we can't make it relative, keep the original path
-                pass
-        
-        # Add color to the level name
-        levelname = record.levelname
-        if levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[levelname]}{levelname}{self.COLORS['RESET']}"
-        
-        # Add color to the entire message including filename and line number
-        if levelname in self.COLORS:
-            # Colorize the entire log message
-            original_message = super().format(record)
-            colored_message = f"{self.COLORS[levelname]}{original_message}{self.COLORS['RESET']}"
-            return colored_message
+        pathname = record.pathname
+        if pathname:
+            relative_path = self._relative_paths.get(pathname)
+            if relative_path is None:
+                try:
+                    relative_path = str(pathlib.Path(pathname).relative_to(self.PROJECT_ROOT))
+                except ValueError:
+                    # If we can't make it relative, keep the original path
+                    relative_path = pathname
+                self._relative_paths[pathname] = relative_path
+            record.pathname = relative_path
         
+        formatter = self._level_formatters.get(record.levelname)
+        if formatter is not None:
+            return formatter.format(record)
         return super().format(record)
 
+# Formatter for console handlers, built on first use
+_console_formatter: Optional[ColoredFormatter] = None
+
 def setup_logger(name: str, level: Optional[int] = None) -> logging.Logger:
     """
     Set up a logger with the specified name and level.
@@ -81,12 +94,15 @@ def setup_logger(name: str, level: Optional[int] = None) -> logging.Logger:
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logger_level)
     
-    # Create formatter
-    formatter = ColoredFormatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(pathname)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(formatter)
+    # All console handlers share one formatter, and with it the relative path cache
+    global _console_formatter
+    if _console_formatter is None:
+        _console_formatter = ColoredFormatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(pathname)s:%(lineno)d - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S',
+            use_color=sys.stdout.isatty()
+        )
+    console_handler.setFormatter(_console_formatter)
     
     # Add handler to logger
     logger.addHandler(console_handler)
@@ -0,0 +1,79 @@
+from array import array
+from typing import Iterator, Optional
+
+
+class RingBuffer:
+    """Fixed-capacity circular buffer of floats with O(1) append, indexed access and rolling stats"""
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self._values = array('d', [0.0]) * capacity  # preallocated unboxed doubles
+        self._index = 0  # next write position
+        self._count = 0
+        # Running sums for O(1) mean/variance over the buffered values
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def append(self, value: float) -> Optional[float]:
+        """Append a value, returning the evicted value once the buffer is full"""
+        evicted = self._values[self._index] if self._count == self.capacity else None
+        self._values[self._index] = value
+        self._index += 1
+        if self._index == self.capacity:
+            self._index = 0
+        if self._count < self.capacity:
+            self._count += 1
+
+        if evicted is not None:
+            self._sum -= evicted
+            self._sum_sq -= evicted * evicted
+        self._sum += value
+        self._sum_sq += value * value
+        if self._index == 0:
+            # Resync once per wrap so rounding error cannot accumulate
+            self._sum = sum(self._values)
+            self._sum_sq = sum(v * v for v in self._values)
+        return evicted
+
+    def mean(self) -> float:
+        """Get the mean of the buffered values (0.0 when empty)"""
+        if self._count == 0:
+            return 0.0
+        return self._sum / self._count
+
+    def variance(self) -> float:
+        """Get the population variance of the buffered values (0.0 when empty)"""
+        if self._count == 0:
+            return 0.0
+        mean = self._sum / self._count
+        return max(self._sum_sq / self._count - mean * mean, 0.0)
+
+    def is_full(self) -> bool:
+        """Check whether the buffer holds capacity values"""
+        return self._count == self.capacity
+
+    def clear(self):
+        """Remove all values from the buffer"""
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> float:
+        """Get a value by position, oldest first; negative indices count from the newest"""
+        if i < 0:
+            i += self._count
+        if i < 0 or i >= self._count:
+            raise IndexError("RingBuffer index out of range")
+        return self._values[(self._index - self._count + i) % self.capacity]
+
+    def __iter__(self) -> Iterator[float]:
+        """Iterate values from oldest to newest"""
+        start = self._index - self._count
+        for i in range(self._count):
+            yield self._values[(start + i) % self.capacity]